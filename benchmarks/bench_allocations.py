@@ -0,0 +1,112 @@
+"""Allocation profile of games per phase and per agent strategy, based on tracemalloc.
+
+For every section the number of calls, the peak of the memory allocated during a call (temporary objects included) and the memory that is still allocated after
+the call are reported as averages per call. The strategies are called inside the decisions, so they are profiled in a separate pass.
+Both action representations are profiled: PlayerAction objects and compact actions.
+
+Run from the project root:
+    python benchmarks/bench_allocations.py [number of games]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boardgame import classes
+from boardgame.agent import Agent
+from boardgame.classes import Game
+from boardgame.scenario import Scenario
+
+NUMBER_OF_GAMES = 50
+
+# (owner, attribute, section name) of the profiled functions per pass
+PHASE_SECTIONS = [
+    (Agent, "get_next_action_for_player", "action phase: decision"),
+    (classes, "run_action", "action phase: run action"),
+    (Game, "resupply_phase", "resupply phase"),
+    (Game, "damage_phase", "damage phase"),
+]
+STRATEGY_SECTIONS = [
+    (Agent, "_choose_driver_actions", "driver strategy"),
+    (Agent, "_choose_industry_actions", "industry strategy"),
+    (Agent, "_choose_investor_actions", "investor strategy"),
+]
+
+
+class _Section():
+    """Allocation statistics of one profiled function.
+    """
+    def __init__(self, name:str) -> None:
+        self.name = name
+        self.calls = 0
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+
+
+def _wrap(owner, attribute:str, section:_Section):
+    """Replace a function by a wrapper that measures the allocations of each call. Returns the original function.
+    """
+    original = getattr(owner, attribute)
+
+    def wrapper(*args, **kwargs):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            section.calls += 1
+            section.peak_bytes += peak - before
+            section.retained_bytes += after - before
+
+    setattr(owner, attribute, wrapper)
+    return original
+
+
+def profile(sections:list[tuple], compact_actions:bool, number_of_games:int = NUMBER_OF_GAMES) -> list[_Section]:
+    """Play games with tracemalloc and the given functions wrapped.
+
+    Args:
+        sections (list[tuple]): (owner, attribute, section name) of the profiled functions.
+        compact_actions (bool): Let the agent return compact actions.
+        number_of_games (int, optional): Number of played games. Defaults to NUMBER_OF_GAMES.
+
+    Returns:
+        list[_Section]: Statistics per section.
+    """
+    scenario = Scenario()
+    # warm up the caches, so that only the steady state is measured
+    game = scenario.new_game(1, disable_logging=True)
+    game.set_agent(Agent(game, compact_actions=compact_actions))
+    game.play_game()
+
+    statistics = [_Section(name) for _, _, name in sections]
+    originals = [_wrap(owner, attribute, section) for (owner, attribute, _), section in zip(sections, statistics)]
+    tracemalloc.start()
+    try:
+        for random_seed in range(1, number_of_games + 1):
+            game = scenario.new_game(random_seed, disable_logging=True)
+            game.set_agent(Agent(game, compact_actions=compact_actions))
+            game.play_game()
+    finally:
+        tracemalloc.stop()
+        for (owner, attribute, _), original in zip(sections, originals):
+            setattr(owner, attribute, original)
+    return statistics
+
+
+def main() -> None:
+    number_of_games = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_GAMES
+    for compact_actions in (False, True):
+        print(f"{'compact actions' if compact_actions else 'PlayerAction objects'}, {number_of_games} games")
+        print(f"  {'section':28s}{'calls':>10s}{'peak B/call':>14s}{'retained B/call':>18s}")
+        for sections in (PHASE_SECTIONS, STRATEGY_SECTIONS):
+            for section in profile(sections, compact_actions, number_of_games):
+                calls = max(section.calls, 1)
+                print(f"  {section.name:28s}{section.calls:10d}{section.peak_bytes / calls:14.1f}{section.retained_bytes / calls:18.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
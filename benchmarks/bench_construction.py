@@ -0,0 +1,47 @@
+"""Benchmark of the construction cost of games and agents compared to playing them.
+
+Run from the project root:
+    python benchmarks/bench_construction.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boardgame.agent import Agent
+from boardgame.classes import Game
+from boardgame.scenario import Scenario
+
+NUMBER = 20000
+REPETITIONS = 5
+GAME_KWARGS = {"cascade_max_level": 8, "number_of_fund_cards": 40}
+
+
+def _microseconds(statement, number:int = NUMBER) -> float:
+    """Best time of a statement over several repetitions in microseconds per call.
+    """
+    return min(timeit.repeat(statement, number=number, repeat=REPETITIONS)) / number * 1e6
+
+
+def _play(game:Game) -> None:
+    game.set_agent(Agent(game))
+    game.play_game()
+
+
+def main() -> None:
+    scenario = Scenario.from_game_kwargs(**GAME_KWARGS)
+    game = scenario.new_game(1, disable_logging=True)
+    measurements = [
+        ("Scenario.from_game_kwargs", lambda: Scenario.from_game_kwargs(**GAME_KWARGS)),
+        ("Game(**kwargs)", lambda: Game(random_seed=1, disable_logging=True, **GAME_KWARGS)),
+        ("scenario.new_game()", lambda: scenario.new_game(1, disable_logging=True)),
+        ("Agent(game)", lambda: Agent(game)),
+    ]
+    for name, statement in measurements:
+        print(f"{name + ':':28s}{_microseconds(statement):10.2f} us")
+    print(f"{'new_game() + play_game():':28s}{_microseconds(lambda: _play(scenario.new_game(1, disable_logging=True)), number=500):10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
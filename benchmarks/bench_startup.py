@@ -0,0 +1,61 @@
+"""Benchmark of package import time and first-game latency.
+
+Run from the project root:
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boardgame.workers import init_worker
+
+REPETITIONS = 5
+
+
+def _time_in_fresh_interpreter(statement:str) -> float:
+    """Run a statement in a fresh interpreter and return the seconds it took, measured inside the interpreter.
+    """
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _play_first_game() -> float:
+    """Play one game and return the seconds it took.
+    """
+    from boardgame.agent import Agent
+    from boardgame.classes import Game
+    start = time.perf_counter()
+    g = Game(random_seed=1, disable_logging=True)
+    g.set_agent(Agent(g))
+    g.play_game()
+    return time.perf_counter() - start
+
+
+def _median(values:list[float]) -> float:
+    return sorted(values)[len(values) // 2]
+
+
+def main() -> None:
+    imports = [_time_in_fresh_interpreter("import boardgame.classes, boardgame.agent") for _ in range(REPETITIONS)]
+    first_games = [_time_in_fresh_interpreter("from boardgame.classes import Game; from boardgame.agent import Agent; g = Game(random_seed=1, disable_logging=True); g.set_agent(Agent(g)); g.play_game()") for _ in range(REPETITIONS)]
+    print(f"import boardgame.classes, boardgame.agent: {_median(imports) * 1000:8.2f} ms")
+    print(f"import + first game (cold):               {_median(first_games) * 1000:8.2f} ms")
+
+    for name, kwargs in [("spawn worker, cold", {}), ("spawn worker, init_worker", {"initializer": init_worker})]:
+        latencies = []
+        for _ in range(REPETITIONS):
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), **kwargs) as pool:
+                # the first submission waits until the worker has started (and run its initializer), so only the game itself is measured
+                pool.submit(time.perf_counter).result()
+                latencies.append(pool.submit(_play_first_game).result())
+        print(f"first game in {name + ':':27s}{_median(latencies) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
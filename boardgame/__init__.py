@@ -1,4 +1,38 @@
-import logging
-# logging configuration 
-logging.basicConfig(filename='game.log', level=logging.DEBUG, filemode='w')
+"""Backend logic for the board game and the agent.
 
+Importing the package has no side effects. The log file is configured the first time a game with enabled logging is created.
+"""
+
+LOG_FILE = 'game.log'
+# logging.INFO, defined here to avoid importing logging for games without logging
+LOG_LEVEL_INFO = 20
+
+
+class _NullLogger():
+    """Stand-in for a logger of games with disabled logging. Avoids importing and configuring the logging module when it is not needed.
+    """
+    def debug(self, *args, **kwargs) -> None:
+        pass
+
+    info = warning = error = debug
+
+    def isEnabledFor(self, level:int) -> bool:
+        return False
+
+NULL_LOGGER = _NullLogger()
+
+
+def get_game_logger(enabled:bool = True):
+    """Get the logger used by a game. The first call with enabled logging configures logging into LOG_FILE, unless logging was already configured by the application.
+
+    Args:
+        enabled (bool, optional): Set to false to get a logger that discards all messages. Defaults to True.
+
+    Returns:
+        logging.Logger: Logger of the package or a logger that discards all messages.
+    """
+    if not enabled:
+        return NULL_LOGGER
+    import logging
+    logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, filemode='w')
+    return logging.getLogger('boardgame')
@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import Deque, List, TYPE_CHECKING
-from boardgame.config import DO_NOTHING_ACTION_NAME, GENERATE_GOODS_ACTION_NAME, PLAYER_TYPE_DRIVER, PLAYER_TYPE_INDUSTRY, REPAIR_ACTION_NAME, RUN_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME
+from boardgame.config import AGENT_AVOID_SHARED_REPAIR_TARGET, AGENT_INDUSTRY_EXTRA_FREIGHT, AGENT_INDUSTRY_FUNDS_RESERVE, AGENT_INVESTOR_FOLLOWS_INDUSTRY, AGENT_INVESTOR_SHARE_THRESHOLD, AGENT_LANE_REPAIR_BONUS, AGENT_MIN_REPAIR_DAMAGE, AGENT_PARAMETERS, DO_NOTHING_ACTION_NAME, GENERATE_GOODS_ACTION_NAME, PLAYER_TYPE_DRIVER, PLAYER_TYPE_INDUSTRY, REPAIR_ACTION_NAME, RUN_ACTION_NAME, SHARE_RESOURCES_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME
+from collections import deque
 from collections.abc import Iterable
 from boardgame.player_actions import ACTIONS, PlayerAction, do_player_action_run
 # enable import only for type checking to avoid recursive imports
 if TYPE_CHECKING:
-    from boardgame.classes import Game, Player
+    from boardgame.classes import Game, Node, Player
+    from boardgame.endgame import EndgameOracle
 
 ### Module methods START###
 
@@ -18,12 +20,12 @@ def parse_nodes_to_graph_format(nodes):
     
 
 # Code by Eryk Kopczyński https://www.python.org/doc/essays/graphs/ using Breadth First
-# adapted not to use Deque but a simple list instead
+# Games use CSRGraph.shortest_path, which resolves ties the same way. 
 def find_shortest_path(graph, start, end):
     dist = {start: [start]}
-    q = [start]
+    q = deque([start])
     while len(q):
-        at = q.pop(0)
+        at = q.popleft()
         for next in graph[at]:
             if next not in dist:
                 dist[next] = [dist[at], next]
@@ -41,153 +43,254 @@ def flatten_list(l):
 ### Module methods END ###
 
 
+class _Plan():
+    """Internally used to represent the planned actions of a player. The actions are created one at a time while the player walks along a route, followed by an optional final action,
+    so a plan costs the same no matter how many of its steps are played before it is replaced.
+    """
+    def __init__(self, route:tuple[int, ...] = (), route_action_name:str = RUN_ACTION_NAME, final_action_name:str = None, final_parameters:dict = None) -> None:
+        """Constructor of boardgame.agent._Plan
+
+        Args:
+            route (tuple[int, ...], optional): Node ids of the route including the current location of the player, e.g. from CSRGraph.route. Defaults to ().
+            route_action_name (str, optional): Action that moves the player to the next node of the route. Defaults to RUN_ACTION_NAME.
+            final_action_name (str, optional): Action after the end of the route. Defaults to None.
+            final_parameters (dict, optional): Parameters of the final action. Defaults to None.
+        """
+        self.route = route
+        self.route_action_name = route_action_name
+        self.final_action_name = final_action_name
+        self.final_parameters = final_parameters
+        # index of the next node of the route, the first node is the current location
+        self.position = 1
+
+    def __len__(self) -> int:
+        return max(len(self.route) - self.position, 0) + (self.final_action_name is not None)
+
+    def clear(self) -> None:
+        """Discard all remaining steps.
+        """
+        self.position = len(self.route)
+        self.final_action_name = None
+
+    def pop_action(self, game:Game, player_id:int, compact:bool = False) -> PlayerAction|tuple:
+        """Create the player action of the next step and advance the plan.
+
+        Args:
+            game (Game): Reference to the game object.
+            player_id (int): Id of the player.
+            compact (bool, optional): Return the interned compact action (see Game.compact_action) instead of a PlayerAction object. Defaults to False.
+
+        Returns:
+            PlayerAction | tuple: Player action of the next step.
+        """
+        if self.position < len(self.route):
+            destination_id = self.route[self.position]
+            self.position += 1
+            if compact:
+                return game.compact_action(self.route_action_name, destination_id)
+            return PlayerAction(game, player_id, ACTIONS[self.route_action_name], parameters={'destination_id': destination_id})
+        action_name = self.final_action_name
+        self.final_action_name = None
+        if compact:
+            # all final actions have at most one parameter
+            return game.compact_action(action_name, next(iter(self.final_parameters.values())) if self.final_parameters else None)
+        return PlayerAction(game, player_id, ACTIONS[action_name], parameters=self.final_parameters)
+
+
+
 class Agent():
     """An Agent provides a strategy for (all) players on the board. By this strategy, it decides what operation(s) a player performs in the action phase. 
     """
-    def __init__(self, game:Game) -> None:
+    def __init__(self, game:Game, endgame_oracle:EndgameOracle = None, compact_actions:bool = False, **kwargs) -> None:
         """Constructor for boardgame.agent.Agent
 
         Args:
             game (Game): Reference to game object. 
+            endgame_oracle (EndgameOracle, optional): Oracle from boardgame.endgame that decides the actions instead of the heuristics near the end of the game. Defaults to None.
+            compact_actions (bool, optional): Return interned compact actions (see Game.compact_action) instead of PlayerAction objects, e.g. for sweeps. Defaults to False.
+            **kwargs: Heuristic parameters, see AGENT_PARAMETERS in config.py for names and defaults. 
+
+        Raises:
+            ValueError: If an unknown heuristic parameter is given.
         """
+        unknown_parameters = set(kwargs) - set(AGENT_PARAMETERS)
+        if unknown_parameters:
+            raise ValueError(f"Unknown agent parameters: {sorted(unknown_parameters)}")
+        self.lane_repair_bonus = kwargs.get('lane_repair_bonus', AGENT_LANE_REPAIR_BONUS)
+        self.min_repair_damage = kwargs.get('min_repair_damage', AGENT_MIN_REPAIR_DAMAGE)
+        self.avoid_shared_repair_target = kwargs.get('avoid_shared_repair_target', AGENT_AVOID_SHARED_REPAIR_TARGET)
+        self.industry_extra_freight = kwargs.get('industry_extra_freight', AGENT_INDUSTRY_EXTRA_FREIGHT)
+        self.industry_funds_reserve = kwargs.get('industry_funds_reserve', AGENT_INDUSTRY_FUNDS_RESERVE)
+        self.investor_share_threshold = kwargs.get('investor_share_threshold', AGENT_INVESTOR_SHARE_THRESHOLD)
+        self.investor_follows_industry = kwargs.get('investor_follows_industry', AGENT_INVESTOR_FOLLOWS_INDUSTRY)
 
         self.game = game
-        self.graph = parse_nodes_to_graph_format(game.nodes)
+        self.graph = game.graph
+        self.endgame_oracle = endgame_oracle
+        self.compact_actions = compact_actions
 
         # The current implementation prioritizes nodes that are located on the direct path between START and TARGET node, i.e. the "lane". 
-        self.node_ids_on_lane = find_shortest_path(self.graph, game.start_node_id, game.end_node_id)
-        # The action queue for each player contains a list of planned actions. It is deleted and reevaluated, if an action becomes unfeasible. 
-        self.action_queues = {player.id: [] for player in self.game.players}
+        self.node_ids_on_lane = self.graph.shortest_path(game.start_node_id, game.end_node_id)
+        self.node_id_set_on_lane = set(self.node_ids_on_lane)
+        # The action queue for each player contains the plan of the player. It is cleared and reevaluated, if an action becomes unfeasible. 
+        self.action_queues = {player.id: _Plan() for player in self.game.players}
         # The driver players know if the current repair targets to avoid always choosing the same repair target. 
         self.repair_targets = [] 
 
 
-    def get_next_action_for_player(self, player_id:int) -> PlayerAction: 
+    def get_next_action_for_player(self, player_id:int) -> PlayerAction|tuple: 
         """Main function for returning a PlayerAction based on the substrategy of the current player type. 
 
         Args:
             player_id (int): Id of the player. 
 
         Returns:
-            PlayerAction: Player action object containing a reference to the player, the action and the parameters. 
+            PlayerAction | tuple: Player action object containing a reference to the player, the action and the parameters, or a compact action if compact_actions is set. Actions of the endgame oracle are always PlayerAction objects. 
         """
+        if self.endgame_oracle is not None:
+            action = self.endgame_oracle.best_action(self.game)
+            if action is not None:
+                # the planned actions are outdated once the oracle takes over
+                self.reset_plan(player_id)
+                return action
         if len(self.action_queues[player_id]) == 0:
-            player_type = self.game._get_player_by_id(player_id).type
-            strategy_function = None 
-            if player_type == PLAYER_TYPE_DRIVER:
-                strategy_function = self._choose_driver_actions
-            elif player_type == PLAYER_TYPE_INDUSTRY:
-                strategy_function = self._choose_industry_actions
-            else:
-                strategy_function = self._choose_investor_actions
-            self.action_queues[player_id] = strategy_function(self.game._get_player_by_id(player_id))
-        return self.action_queues[player_id].pop(0)
-
-    def _choose_driver_actions(self, player:Player) -> list:
+            self.action_queues[player_id] = self._choose_actions(self.game._get_player_by_id(player_id))
+        return self.action_queues[player_id].pop_action(self.game, player_id, self.compact_actions)
+
+    def skip_passive_turn(self, player_id:int, number_of_actions:int) -> bool:
+        """Check if the player would do nothing for the remaining actions of the turn, so that the game can skip the decisions.
+        Doing nothing does not change the game, so if the next decision is to do nothing, all remaining decisions are. In that case the agent's state is updated as if all decisions were made.
+        Otherwise the plan is kept for the next decision.
+
+        Args:
+            player_id (int): Id of the active player.
+            number_of_actions (int): Number of actions left in the turn.
+
+        Returns:
+            bool: True if the remaining actions are skipped.
+        """
+        if self.endgame_oracle is not None or len(self.action_queues[player_id]) > 0:
+            return False
+        player = self.game._get_player_by_id(player_id)
+        plan = self._choose_actions(player)
+        if plan.route or plan.final_action_name != DO_NOTHING_ACTION_NAME:
+            self.action_queues[player_id] = plan
+            return False
+        if player.type == PLAYER_TYPE_DRIVER:
+            # every decision of a driver releases the oldest repair target
+            del self.repair_targets[:number_of_actions - 1]
+        return True
+
+    def _choose_actions(self, player:Player) -> _Plan:
+        """Internally called to plan the next actions with the substrategy of the player type.
+
+        Args:
+            player (Player): Player object
+
+        Returns:
+            _Plan: Plan of the player.
+        """
+        if player.type == PLAYER_TYPE_DRIVER:
+            return self._choose_driver_actions(player)
+        elif player.type == PLAYER_TYPE_INDUSTRY:
+            return self._choose_industry_actions(player)
+        else:
+            return self._choose_investor_actions(player)
+
+    def reset_plan(self, player_id:int) -> None:
+        """Discard the planned actions of a player, e.g. because one of them turned out to be invalid. The next request replans from the current state.
+        Plans create their actions lazily, so discarding a plan does not waste the steps that were never played.
+
+        Args:
+            player_id (int): Id of the player.
+        """
+        self.action_queues[player_id].clear()
+
+    def _get_nodes_in_board_order(self, node_ids:set[int]) -> list[Node]:
+        """Internally called to resolve a set of node ids to nodes, ordered as on the board so that ties between equally rated nodes are broken the same way in every game.
+
+        Args:
+            node_ids (set[int]): Node ids.
+
+        Returns:
+            list[Node]: Node objects in board order.
+        """
+        positions = self.graph.positions
+        return [self.game._get_node_by_id(node_id) for node_id in sorted(node_ids, key=positions.__getitem__)]
+
+    def _choose_driver_actions(self, player:Player) -> _Plan:
         """Internally called to determine the substrategy for the driver type players.
 
         Args:
             player (Player): Player object
 
         Returns:
-            list: Action queue list, i.e. list containing Player Action objects. 
+            _Plan: Plan of the player. 
         """
-        actions = []
-        # get damage nodes in lane 
-        damaged_nodes_in_lane = [node for node in self.game.nodes if node.damage > 0 and node.id in self.node_ids_on_lane]
-        # remove target if the other driver is already doing it
-          # delete the oldest repair target 
-        if len(self.repair_targets) > 0:
-            self.repair_targets.pop(0)
-            try:
-                damaged_nodes_in_lane.remove(self.repair_targets)
-            except ValueError:
-                # no harm done
-                pass
-        if len(damaged_nodes_in_lane) > 0:
-            # get highest damaged node in lane
-            damaged_nodes_in_lane.sort(reverse=True, key=lambda node: node.damage)
-            highest_damage_node = damaged_nodes_in_lane[0]
-            # register node as repair target
-            self.repair_targets.append(highest_damage_node)
-            path_to_node = find_shortest_path(self.graph, player.location_id, highest_damage_node.id)[1:]
-            # move to highest damage node in lane and repair if arrived at that node 
-            for node in path_to_node:
-                actions.append(PlayerAction(self.game, player.id, ACTIONS[RUN_ACTION_NAME], parameters={'destination_id': node}))
-            actions.append(PlayerAction(self.game, player.id, action=ACTIONS[REPAIR_ACTION_NAME]))    
-            return actions
-        # if none is damaged, move to damaged nodes out of lane:
-        damaged_nodes = [node for node in self.game.nodes if node.damage > 0] 
-        # remove targets if the other driver is already doing it
+        # delete the oldest repair target, the remaining one belongs to the other driver 
         if len(self.repair_targets) > 0:
             self.repair_targets.pop(0)
-            try:
-                damaged_nodes_in_lane.remove(self.repair_targets)
-            except ValueError:
-                # no harm done
-                pass
-        if len(damaged_nodes) > 0:
-            damaged_nodes.sort(reverse=True, key=lambda node: node.damage) 
-            highest_damage_node = damaged_nodes[0]
-            # register node as repair target
-            self.repair_targets.append(highest_damage_node)
-            path_to_node = find_shortest_path(self.graph, player.location_id, highest_damage_node.id)[1:]
-            for node in path_to_node:
-                actions.append(PlayerAction(self.game, player.id, ACTIONS[RUN_ACTION_NAME], parameters={'destination_id': node}))
-            actions.append(PlayerAction(self.game, player.id, action=ACTIONS[REPAIR_ACTION_NAME]))
-            return actions
-        else:
-            return actions.append(PlayerAction(self.game, player.id, ACTIONS[DO_NOTHING_ACTION_NAME]))
-        
-         
+        damaged_nodes = [node for node in self._get_nodes_in_board_order(self.game.damaged_node_ids) if node.damage >= self.min_repair_damage]
+        # remove target if the other driver is already doing it
+        if self.avoid_shared_repair_target:
+            damaged_nodes = [node for node in damaged_nodes if node not in self.repair_targets] or damaged_nodes
+        if len(damaged_nodes) == 0:
+            return _Plan(final_action_name=DO_NOTHING_ACTION_NAME)
+        # get highest damaged node, nodes in the lane receive a bonus. Ties are resolved by board order. 
+        highest_damage_node = max(damaged_nodes, key=lambda node: node.damage + self.lane_repair_bonus if node.id in self.node_id_set_on_lane else node.damage)
+        # register node as repair target
+        self.repair_targets.append(highest_damage_node)
+        # move to highest damage node and repair if arrived at that node 
+        return _Plan(self.graph.route(player.location_id, highest_damage_node.id), RUN_ACTION_NAME, REPAIR_ACTION_NAME)
 
-    def _choose_industry_actions(self, player:Player) -> list:
+    def _choose_industry_actions(self, player:Player) -> _Plan:
         """Internally called to determine the substrategy for the industry type players.
 
         Args:
             player (Player): player object
 
         Returns:
-            list: Action queue list, i.e. list containing Player Action objects.
+            _Plan: Plan of the player.
         """
-        actions = []
         # IF number of freight units below target, create new unit if enough funds
-        number_of_freight_units_in_game = sum([node.freight for node in self.game.nodes])
-        if number_of_freight_units_in_game < self.game.target_freight and player.funds >= 2:
-            actions.append(PlayerAction(self.game, player.id, ACTIONS[GENERATE_GOODS_ACTION_NAME]))
-            return actions 
+        number_of_freight_units_in_game = sum([node.freight for node in self._get_nodes_in_board_order(self.game.freight_node_ids)])
+        if number_of_freight_units_in_game < self.game.target_freight + self.industry_extra_freight and player.funds >= 2 + self.industry_funds_reserve:
+            return _Plan(final_action_name=GENERATE_GOODS_ACTION_NAME)
         # IF freight unit at current location move towards destination 
         if self.game._get_node_by_id(player.location_id).freight > 0 and not player.location_id == self.game.end_node_id: 
-            path_to_destination = find_shortest_path(self.graph, player.location_id, self.game.end_node_id)[1:]
-            for node in path_to_destination:
-                actions.append(PlayerAction(self.game, player.id, ACTIONS[TRANSPORT_GOODS_ACTION_NAME], parameters={'destination_id': node}))
-            return actions 
+            return _Plan(self.graph.route(player.location_id, self.game.end_node_id), TRANSPORT_GOODS_ACTION_NAME)
         # ELSE move towards closest node with freight units if such are present
-        nodes_with_freight_units = [node for node in self.game.nodes if node.freight > 0 and node.id != self.game.end_node_id]
+        nodes_with_freight_units = [node for node in self._get_nodes_in_board_order(self.game.freight_node_ids) if node.id != self.game.end_node_id]
         if len(nodes_with_freight_units)> 0:
-            path_to_nodes = {}
-            for node in nodes_with_freight_units:
-                path_to_nodes[node.id] = find_shortest_path(self.graph, player.location_id, node.id)[1:]
-            
-            if len(path_to_nodes) == 0:
-                return actions.append(PlayerAction(self.game, player.id, ACTIONS[DO_NOTHING_ACTION_NAME]))
-            closest_node_id = min(path_to_nodes, key=path_to_nodes.get)
-            for node in path_to_nodes[closest_node_id]:
-                actions.append(PlayerAction(self.game, player.id, ACTIONS[RUN_ACTION_NAME], parameters={'destination_id': node}))
-            return actions 
+            routes = {node.id: self.graph.route(player.location_id, node.id) for node in nodes_with_freight_units}
+            # the routes are compared as sequences of the following nodes, as the original action lists were
+            closest_node_id = min(routes, key=lambda node_id: routes[node_id][1:])
+            return _Plan(routes[closest_node_id], RUN_ACTION_NAME)
         else:
-            actions.append(PlayerAction(self.game, player.id, ACTIONS[DO_NOTHING_ACTION_NAME]))
+            return _Plan(final_action_name=DO_NOTHING_ACTION_NAME)
     
-    def _choose_investor_actions(self, player:Player) -> list:
-        """nternally called to determine the substrategy for the industry type players. Investors always choose to do nothing in the current implementation. 
+    def _choose_investor_actions(self, player:Player) -> _Plan:
+        """Internally called to determine the substrategy for the investor type players. With the default parameters, investors always choose to do nothing. 
 
         Args:
             player (Player): Player object
 
         Returns:
-            list: Action queue list, i.e. list containing Player Action objects.
+            _Plan: Plan of the player.
         """
-        return [PlayerAction(self.game, player.id, ACTIONS[DO_NOTHING_ACTION_NAME])]
+        # share funds with a player at the same node, the industry needs funds for new freight units and is preferred
+        if player.funds > self.investor_share_threshold:
+            receivers = [other_player for other_player in self.game.players if other_player.id != player.id and other_player.location_id == player.location_id]
+            receivers.sort(key=lambda other_player: other_player.type != PLAYER_TYPE_INDUSTRY)
+            if len(receivers) > 0:
+                return _Plan(final_action_name=SHARE_RESOURCES_ACTION_NAME, final_parameters={'target_player_id': receivers[0].id})
+        # move one step towards the industry player
+        if self.investor_follows_industry:
+            industry_player = [other_player for other_player in self.game.players if other_player.type == PLAYER_TYPE_INDUSTRY][0]
+            route_to_industry = self.graph.route(player.location_id, industry_player.location_id)
+            if len(route_to_industry) > 1:
+                return _Plan(route_to_industry[:2], RUN_ACTION_NAME)
+        return _Plan(final_action_name=DO_NOTHING_ACTION_NAME)
 
 
 
@@ -0,0 +1,224 @@
+"""Mergeable streaming aggregates of game results.
+
+Every aggregate is updated in place with one value at a time, needs a fixed amount of memory and can be merged with an aggregate of the same kind, e.g. one
+computed in another worker process. GameSummary combines them to the summary of one parameter point of a sweep, see boardgame.sweep.run_sweep_summaries.
+
+    summary = GameSummary()
+    for result in play_games(range(1, 101)):
+        summary.add(result)
+    summary.to_dict()["win_rate"]
+"""
+from __future__ import annotations
+from boardgame.config import GAME_LOST_STR_CARDS, GAME_LOST_STR_CASCADE
+import math
+
+# quantiles reported by GameSummary.to_dict
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class RunningStatistics():
+    """Count, mean and variance of a stream of values (Welford's algorithm).
+    """
+    def __init__(self) -> None:
+        """Constructor of boardgame.aggregates.RunningStatistics
+        """
+        self.count = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean
+        self._m2 = 0.0
+
+    def add(self, value:float) -> None:
+        """Add a value.
+
+        Args:
+            value (float): The value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other:RunningStatistics) -> None:
+        """Add all values of another instance (Chan's parallel algorithm).
+
+        Args:
+            other (RunningStatistics): Statistics of other values.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, NaN for less than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, NaN for less than two values."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch():
+    """Approximate quantiles of a stream of values in fixed memory (KLL sketch).
+
+    Values are collected in a hierarchy of compactors. A full compactor sorts its values and passes every second value to the next level, where each value
+    stands for twice as many values. The rank error is about 1.7 / k of the number of values. The compactions alternate between the even and odd positions,
+    so the sketch is deterministic for the same values added and merged in the same order, see boardgame.sweep.run_sweep_summaries.
+    """
+    def __init__(self, k:int = 128) -> None:
+        """Constructor of boardgame.aggregates.QuantileSketch
+
+        Args:
+            k (int, optional): Capacity of the top compactor, i.e. the trade-off between memory and accuracy. Defaults to 128.
+        """
+        self.k = k
+        self.count = 0
+        self.compactors:list[list[float]] = [[]]
+        self._offsets:list[int] = [0]
+
+    def add(self, value:float) -> None:
+        """Add a value.
+
+        Args:
+            value (float): The value.
+        """
+        self.compactors[0].append(value)
+        self.count += 1
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other:QuantileSketch) -> None:
+        """Add all values of another sketch.
+
+        Args:
+            other (QuantileSketch): Sketch of other values.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+            self._offsets.append(0)
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q:float) -> float:
+        """Get the approximate q-quantile.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float: Smallest value whose rank is at least q times the number of values, NaN if the sketch is empty.
+        """
+        if self.count == 0:
+            return math.nan
+        weighted_items = sorted((value, 2 ** level) for level, items in enumerate(self.compactors) for value in items)
+        total_weight = sum(weight for _, weight in weighted_items)
+        cumulative_weight = 0
+        for value, weight in weighted_items:
+            cumulative_weight += weight
+            if cumulative_weight >= q * total_weight:
+                return value
+        return weighted_items[-1][0]
+
+    def _capacity(self, level:int) -> int:
+        """Internally called to get the capacity of a compactor. Lower levels are smaller, the top level has capacity k.
+        """
+        return max(int(self.k * (2 / 3) ** (len(self.compactors) - level - 1)), 2)
+
+    def _compress(self) -> None:
+        """Internally called to compact full compactors until the sketch fits into its memory again.
+        """
+        while sum(len(items) for items in self.compactors) >= sum(self._capacity(level) for level in range(len(self.compactors))):
+            for level, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.compactors):
+                        self.compactors.append([])
+                        self._offsets.append(0)
+                    items.sort()
+                    # an odd value out stays on this level, so the total weight is unchanged
+                    kept = [items.pop()] if len(items) % 2 else []
+                    self.compactors[level + 1].extend(items[self._offsets[level]::2])
+                    self._offsets[level] = 1 - self._offsets[level]
+                    self.compactors[level] = kept
+                    break
+
+
+class GameSummary():
+    """Summary of the results of many games with the same parameters: win rate, loss reasons, and mean, variance, histogram and quantiles of the turn count.
+    Games that were terminated early (see Game.play_game) count as lost, but their reason and turn are not those of the full game, so they are only counted in
+    terminated_early and are left out of the loss reasons and the turn statistics.
+    """
+    def __init__(self, quantile_sketch_size:int = 128) -> None:
+        """Constructor of boardgame.aggregates.GameSummary
+
+        Args:
+            quantile_sketch_size (int, optional): Parameter k of the QuantileSketch of the turn count. Defaults to 128.
+        """
+        self.games = 0
+        self.wins = 0
+        # lost games that were ended as soon as they could not be won anymore, see Game.play_game
+        self.terminated_early = 0
+        self.loss_reasons = {GAME_LOST_STR_CASCADE: 0, GAME_LOST_STR_CARDS: 0}
+        self.turns = RunningStatistics()
+        # the number of turns is bounded by the player cards, so the histogram has a fixed size
+        self.turn_histogram:dict[int, int] = {}
+        self.turn_quantiles = QuantileSketch(quantile_sketch_size)
+
+    def add(self, result:dict) -> None:
+        """Add the result of a game.
+
+        Args:
+            result (dict): Result dictionary of Game.play_game.
+        """
+        self.games += 1
+        if result.get("terminated_early"):
+            self.terminated_early += 1
+            return
+        if result["result"] == "WON":
+            self.wins += 1
+        else:
+            self.loss_reasons[result["reason"]] = self.loss_reasons.get(result["reason"], 0) + 1
+        turn = result["turn"]
+        self.turns.add(turn)
+        self.turn_histogram[turn] = self.turn_histogram.get(turn, 0) + 1
+        self.turn_quantiles.add(turn)
+
+    def merge(self, other:GameSummary) -> None:
+        """Add the results summarized by another instance, e.g. of another worker.
+
+        Args:
+            other (GameSummary): Summary of other games with the same parameters.
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.terminated_early += other.terminated_early
+        for reason, count in other.loss_reasons.items():
+            self.loss_reasons[reason] = self.loss_reasons.get(reason, 0) + count
+        self.turns.merge(other.turns)
+        for turn, count in other.turn_histogram.items():
+            self.turn_histogram[turn] = self.turn_histogram.get(turn, 0) + count
+        self.turn_quantiles.merge(other.turn_quantiles)
+
+    def to_dict(self) -> dict:
+        """Get the summary as plain values, e.g. for a pandas DataFrame.
+
+        Returns:
+            dict: Fields "games", "wins", "win_rate", "losses" (count per reason), "terminated_early" (count of lost games that were terminated early), "turn_mean" (of the games played to the end), "turn_std", "turn_histogram" (count per turn, sorted by turn) and "turn_quantiles" (value per quantile in SUMMARY_QUANTILES).
+        """
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": self.wins / self.games if self.games else math.nan,
+            "losses": dict(self.loss_reasons),
+            "terminated_early": self.terminated_early,
+            "turn_mean": self.turns.mean if self.turns.count else math.nan,
+            "turn_std": self.turns.std,
+            "turn_histogram": dict(sorted(self.turn_histogram.items())),
+            "turn_quantiles": {q: self.turn_quantiles.quantile(q) for q in SUMMARY_QUANTILES}
+        }
@@ -1,50 +1,73 @@
 from __future__ import annotations
-from boardgame.player_actions import ACTIONS, InvalidActionException, PlayerAction
-from typing import TYPE_CHECKING
-from boardgame.agent import Agent
+from boardgame import LOG_LEVEL_INFO, get_game_logger
+from boardgame.player_actions import InvalidActionException, PlayerAction, compact_action, get_action_name, intern_compact_actions, run_action
+from types import MappingProxyType
+from typing import Any, Generator, TYPE_CHECKING
 from boardgame.config import *
-import json
+from boardgame.graph import CSRGraph
+from boardgame.scenario import DEFAULT_MAP_PATH, Scenario
+import os
 import random
-import math
-import logging
+import threading
 
 # enable import only for type checking to avoid recursive imports
 if TYPE_CHECKING:
+    from boardgame.agent import Agent
     from boardgame.player_actions import get_valid_player_actions
+    from boardgame.telemetry import TelemetryRecorder
+
+EMPTY_DAMAGE_CARD_STACK_MESSAGE = "The damage card stack is empty. The next time the damage card are restocked, a card will be drawn and 3 damage points will be added to that note."
+
 
     
 class Game():
     """Instance of the boardgame logic that holds all variables, like players, node status, etc. Provides methods to manipulate game variables and perform game operations. 
     """
-    def __init__(self, random_seed:int = None, disable_logging:bool = False, **kwargs) -> None: 
+    def __init__(self, random_seed:int = None, disable_logging:bool = False, scenario:Scenario = None, **kwargs) -> None: 
         """Constructor of boardgame.classes.Game 
 
         Args:
             random_seed (int, optional): Custom seed for all random operation. Defaults to None.
             disable_logging (bool, optional): Set to true to disable logging, e.g. if many iterations are played at once. Defaults to False.
-        """
-        if disable_logging:
-            logging.disable(100)
-        # initialize parameters either from kwargs or if not present from config.py
-        target_start_node_id = kwargs.get('target_start_node') if kwargs.get('target_start_node') else TARGET_START_NODE
-        target_end_node_id = kwargs.get('target_end_node') if kwargs.get('target_end_node') else TARGET_END_NODE
-        target_amount = kwargs.get('target_amount') if kwargs.get('target_amount') else TARGET_AMOUNT
-
-        number_of_damage_card_jokers = kwargs.get('number_of_damage_card_jokers') if kwargs.get('number_of_damage_card_jokers') else NUMBER_OF_DAMAGE_CARD_JOKERS
-        number_of_fund_cards = kwargs.get(' number_of_fund_cards') if kwargs.get(' number_of_fund_cards') else NUMBER_OF_FUND_CARDS
-        number_of_destruction_cards = kwargs.get('number_of_destruction_cards') if kwargs.get('number_of_destruction_cards') else NUMBER_OF_DESTRUCTION_CARDS
+            scenario (Scenario, optional): Validated game parameters from boardgame.scenario. Games of the same scenario are copied from a prebuilt template. Defaults to the scenario of the keyword arguments.
+            **kwargs: Game parameters if no scenario is given, see the fields of Scenario, e.g. path_to_map with a custom map file written by boardgame.map_generator. 
 
-        self.cascade_damage_threshold = kwargs.get('cascade_damage_threshold') if kwargs.get('cascade_damage_threshold') else CASCADE_DAMAGE_THRESHOLD
-        self.cascade_max_level = kwargs.get('cascade_max_level') if kwargs.get('cascade_max_level') else CASCADE_MAX_LEVEL
+        Raises:
+            ValueError: If an unknown or invalid game parameter is given.
+        """
+        self.logger = get_game_logger(enabled=not disable_logging)
+        # log messages are only formatted if they are logged. Checked once per game, changes of the log level during a game are not noticed. 
+        self.log_enabled:bool = self.logger.isEnabledFor(LOG_LEVEL_INFO)
+        if scenario is None:
+            scenario = Scenario.from_game_kwargs(**kwargs)
+        elif kwargs:
+            raise ValueError("Game parameters must be given either as scenario or as keyword arguments.")
+        template = _get_template(scenario)
+        self.scenario:Scenario = scenario
+        self.cascade_damage_threshold = scenario.cascade_damage_threshold
+        self.cascade_max_level = scenario.cascade_max_level
 
         
-        if random_seed:
-            random.seed(random_seed)
+        # every game has its own random number generator, so games can run in parallel threads without affecting each other
+        self.random:random.Random = random.Random(random_seed) if random_seed else random.Random()
         self.cascade_level:int = 0
         self.destruction_level:int = 0
-        self.damage_cards:list[int] = _create_and_shuffle_damage_cards(number_of_jokers=number_of_damage_card_jokers)
+        # ids of nodes with damage or freight, kept up to date by the nodes themselves so that strategies do not need to scan the whole board
+        self.damaged_node_ids:set[int] = set()
+        self.freight_node_ids:set[int] = set()
+        self.nodes:list[Node] = [node._copy(self.damaged_node_ids, self.freight_node_ids) for node in template.nodes]
+        self._nodes_by_id:dict[int, Node] = {node.id: node for node in self.nodes}
+        # the adjacency never changes during a game, so all games on the same map share it
+        self.graph:CSRGraph = template.graph
+        self._distances_to_end:dict[int, int] = template.distances_to_end
+        # read-only interned compact actions of the map, shared by all games on it
+        self._compact_actions:MappingProxyType = template.compact_actions
+        # every node except the ports has a damage card 
+        self.damage_cards:list[int] = _create_and_shuffle_damage_cards(node_indices=list(template.damage_card_node_ids), number_of_jokers=scenario.number_of_damage_card_jokers, rng=self.random)
         self.damage_cards_discards:list[int] = []
-        self.player_cards:list[int] = _create_and_shuffle_player_cards(number_of_fund_cards, number_of_destruction_cards)
+        # sizes of the parts of the damage card stack that were shuffled separately, from bottom to top. Players know these, but not the order within a part. 
+        self.damage_card_segments:list[int] = [len(self.damage_cards)]
+        self.player_cards:list[int] = _create_and_shuffle_player_cards(scenario.number_of_fund_cards, scenario.number_of_destruction_cards, rng=self.random)
         self.player_cards_discards:list[int] = []
         self.players:list[Player] = [
             Player(id = 0, type=PLAYER_TYPE_INDUSTRY),
@@ -53,16 +76,26 @@ class Game():
             Player(id = 3, type=PLAYER_TYPE_DRIVER)
         ]
         self.active_player_id:int = 0
-        self.nodes:list[Node] = _load_nodes_from_json()
         self.turn = 0
-        self.start_node_id:int = target_start_node_id
-        self.end_node_id:int = target_end_node_id
-        self.target_freight:int = target_amount
+        self.start_node_id:int = scenario.target_start_node
+        self.end_node_id:int = scenario.target_end_node
+        self.target_freight:int = scenario.target_amount
         self.damage_card_stack_was_empty = False
+        # number of actions that failed with an InvalidActionException 
+        self.invalid_actions:int = 0
+        # set by set_agent, games driven by a BatchScheduler policy can run without agent
+        self.agent:Agent = None
+        self.telemetry:TelemetryRecorder = None
+
+        # every block of turns of all players contains an industry turn, and no freight unit needs more action points than generating it and carrying it along the lane,
+        # so with this many player cards left the game can still be won, see can_still_win
+        lane_actions = 1 + self._distances_to_end.get(self.start_node_id, 1 << 30)
+        self._winnable_player_cards:int = len(self.players) * -(-self.target_freight * lane_actions // 4)
 
         # damage nodes at start 
         for damage_points in range (1,4): 
             node_index = self.damage_cards.pop(0)
+            self._remove_damage_card_from_segments(from_top=False)
             #TODO change indexes to start at 0 and correspond to array positions
             if node_index in range(1, len(self.nodes) + 1):
                 self.nodes[node_index].damage = damage_points
@@ -84,6 +117,15 @@ class Game():
         """
         self.agent = agent
 
+    def set_telemetry(self, telemetry:TelemetryRecorder) -> None:
+        """Set a recorder that records the state of the game at the end of every turn. The recorded series are added to the result of play_game.
+
+        Args:
+            telemetry (TelemetryRecorder): Recorder from boardgame.telemetry.
+        """
+        self.telemetry = telemetry
+        telemetry.attach(self)
+
     def _get_player_by_id(self, id:int) -> Player:
         """Get a reference to a player object by ID. 
 
@@ -106,9 +148,7 @@ class Game():
         Returns:
             Node: Node object
         """
-        for node in self.nodes:
-            if node.id == id:
-                return node
+        return self._nodes_by_id.get(id)
 
     def _add_damage_to_node(self, node_id:int, damage_value:int) -> None: 
         """Internally called to add damage points to a node.
@@ -119,7 +159,8 @@ class Game():
         """
         node =  self._get_node_by_id(node_id)
         node.damage += damage_value
-        logging.info(f"Node {node_id} ({node.name}) receives {damage_value} damage (now has {node.damage})")
+        if self.log_enabled:
+            self.logger.info(f"Node {node_id} ({node.name}) receives {damage_value} damage (now has {node.damage})")
         if node.damage > self.cascade_damage_threshold:
             node.damage = self.cascade_damage_threshold
             self._cascade_node(node_id=node_id)
@@ -136,15 +177,27 @@ class Game():
         node = self._get_node_by_id(node_id)
         node.affected_by_cascade = True
         self.cascade_level += 1
-        logging.info(f"Node {node_id} ({node.name}) is affected by a cascade. Cascade level is now {self.cascade_level}.")
+        if self.log_enabled:
+            self.logger.info(f"Node {node_id} ({node.name}) is affected by a cascade. Cascade level is now {self.cascade_level}.")
         if self.cascade_level > self.cascade_max_level: 
             raise GameLostException(GAME_LOST_STR_CASCADE)  
-        for neighbor_node_id in node.neighbors:
-            neighbor_node = self._get_node_by_id(neighbor_node_id)
+        for neighbor_node_id in self.graph.neighbors(node_id):
+            neighbor_node = self._nodes_by_id[neighbor_node_id]
             if not neighbor_node.affected_by_cascade:
                 self._add_damage_to_node(neighbor_node_id, 1)
         node.affected_by_cascade = False
     
+    def _remove_damage_card_from_segments(self, from_top:bool) -> None:
+        """Internally called to keep track of the segments of the damage card stack when a card is drawn.
+
+        Args:
+            from_top (bool): True if the card was drawn from the top, False if from the bottom of the stack.
+        """
+        index = -1 if from_top else 0
+        self.damage_card_segments[index] -= 1
+        if self.damage_card_segments[index] == 0:
+            self.damage_card_segments.pop(index)
+
     def _get_next_player_id(self) -> int:
         """Internally called to determine the player for the next turn.
 
@@ -153,37 +206,127 @@ class Game():
         """
         return self.players[(self.active_player_id + 1) % len(self.players)].id
     
-    def play_game(self) -> dict: 
+    def _drive(self, steps:Generator[DecisionRequest, PlayerAction, Any]) -> Any:
+        """Internally called to run a step generator to the end, answering every decision request with the agent of the game.
+
+        Args:
+            steps (Generator[DecisionRequest, PlayerAction, Any]): Generator returned by one of the *_steps methods.
+
+        Returns:
+            Any: Return value of the generator.
+        """
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(self.agent.get_next_action_for_player(request.player_id))
+        except StopIteration as e:
+            return e.value
+
+    def play_game(self, terminate_early:bool = False) -> dict: 
         """Starts the game and performs the game loop until the game is won or lost. 
 
+        Args:
+            terminate_early (bool, optional): Check before every turn if the game can still be won (see can_still_win) and end it as lost as soon as it cannot. Defaults to False.
+
         Returns:
-            dict: Result dictionary containing the fields "turn", "result", and in case of a lost game "reason". 
+            dict: Result dictionary containing the fields "turn", "result", in case of a lost game "reason", if a telemetry recorder is set "telemetry", and if terminate_early is set "terminated_early". 
         """
+        return self._drive(self.play_game_steps(fast_forward_passive_turns=True, terminate_early=terminate_early))
+
+    def play_game_steps(self, fast_forward_passive_turns:bool = False, terminate_early:bool = False) -> Generator[DecisionRequest, PlayerAction, dict]:
+        """Play the game as a generator that yields a DecisionRequest whenever a player has to act and expects the chosen PlayerAction to be sent back.
+        Allows a scheduler (see boardgame.scheduler) to interleave many games and let an agent decide for all of them in one batch.
+
+        Args:
+            fast_forward_passive_turns (bool, optional): Skip the decisions of turns in which the agent of the game would do nothing, see Agent.skip_passive_turn. Only valid if the requests are answered by the agent of the game. Defaults to False.
+            terminate_early (bool, optional): End the game as lost before the first turn in which it cannot be won anymore, see can_still_win. The result has the field "terminated_early", 
+                the reason of a terminated game is GAME_LOST_STR_UNWINNABLE and its turn is the turn of the termination, because the full game might have been lost later by either reason. Defaults to False.
+
+        Returns:
+            dict: Result dictionary of play_game as return value of the generator, i.e. StopIteration.value.
+        """
+        terminated_early = False
         while True:
             try: 
-                self.play_turn()
+                if terminate_early and not self.can_still_win():
+                    terminated_early = True
+                    raise GameLostException(GAME_LOST_STR_UNWINNABLE)
+                yield from self.play_turn_steps(fast_forward_passive_turns)
                 self.turn += 1
             except GameLostException as e: 
-                logging.info(f"Game lost: {e.reason}")
-                return {
+                if self.log_enabled:
+                    self.logger.info(f"Game lost: {e.reason}")
+                result = {
                     "turn": self.turn,
                     "result": "LOST", 
                     "reason": e.reason
                 } 
+                break
             except GameWonException as e:
-                logging.info(F"Game Won: {e.message}")
-                return {
+                if self.log_enabled:
+                    self.logger.info(F"Game Won: {e.message}")
+                result = {
                     "turn": self.turn, 
                     "result": "WON"
                 }
+                break
+        if terminate_early:
+            result["terminated_early"] = terminated_early
+        if self.telemetry is not None:
+            result["telemetry"] = self.telemetry.to_dict()
+        return result
+
+    def compact_action(self, action_name:str, argument:Any = None) -> tuple:
+        """Get the compact representation of a player action (see boardgame.player_actions.compact_action). Actions without argument and actions with a
+        destination node of the map are interned, so equal actions are the same object and no tuple is allocated; other actions are created on demand.
+
+        Args:
+            action_name (str): Name of the action, e.g. RUN_ACTION_NAME.
+            argument (Any, optional): Destination node id, target player id, or a tuple of both for COORDINATE_DRIVERS_ACTION_NAME. Defaults to None.
+
+        Returns:
+            tuple: Tuple (action code, argument).
+        """
+        action = self._compact_actions[action_name].get(argument)
+        return action if action is not None else compact_action(action_name, argument)
+
+    def can_still_win(self) -> bool:
+        """Check between two turns if the game can still be won. The industry players are the only players that generate and transport freight units,
+        and every turn draws a player card, so the number of remaining player cards bounds their action points (see boardgame.endgame.available_industry_actions).
+        If these are fewer than the minimum needed to bring the missing freight units to the end node (see boardgame.endgame.minimum_industry_actions),
+        the game is lost whatever the players do. Only the number of remaining player cards is used, not their order.
+
+        Returns:
+            bool: False if the game cannot be won anymore, True if it may still be won.
+        """
+        if len(self.player_cards) >= self._winnable_player_cards:
+            return True
+        # imported here, the solver is not needed by games that are not terminated early
+        from boardgame.endgame import available_industry_actions, minimum_industry_actions
+        freight = {node_id: self._nodes_by_id[node_id].freight for node_id in self.freight_node_ids}
+        needed = minimum_industry_actions(freight, self._distances_to_end, self.start_node_id, self.end_node_id, self.target_freight)
+        player_types = [player.type for player in self.players]
+        active_index = self.players.index(self._get_player_by_id(self.active_player_id))
+        # the active player has not started its action phase yet
+        return needed <= available_industry_actions(player_types, active_index, 4, len(self.player_cards))
     
     def play_turn(self) -> None:
         """Play a single turn of the game.
         """
-        self.action_phase()
-        self.resupply_phase()
-        self.damage_phase()
-        self.active_player_id = self._get_next_player_id()
+        self._drive(self.play_turn_steps(fast_forward_passive_turns=True))
+
+    def play_turn_steps(self, fast_forward_passive_turns:bool = False) -> Generator[DecisionRequest, PlayerAction, None]:
+        """Play a single turn of the game as a generator, see play_game_steps.
+        """
+        try:
+            yield from self.action_phase_steps(fast_forward_passive_turns)
+            self.resupply_phase()
+            self.damage_phase()
+            self.active_player_id = self._get_next_player_id()
+        finally:
+            # the last turn of a game ends with an exception and is recorded as well
+            if self.telemetry is not None:
+                self.telemetry.record(self)
     
     def action_phase(self) -> None: 
         """Play the action phase of a turn.
@@ -191,30 +334,44 @@ class Game():
         Raises:
             GameWonException: If enough freight units are transported to the target node.
         """
-        logging.info(f"Start action phase.")
+        self._drive(self.action_phase_steps(fast_forward_passive_turns=True))
+
+    def action_phase_steps(self, fast_forward_passive_turns:bool = False) -> Generator[DecisionRequest, PlayerAction, None]:
+        """Play the action phase of a turn as a generator, see play_game_steps. Passive turns are only fast-forwarded if logging is disabled, because the
+        skipped actions would not be logged; with logging, every action is requested as usual and the game is identical.
+
+        Raises:
+            GameWonException: If enough freight units are transported to the target node.
+        """
         player = self._get_player_by_id(self.active_player_id)
         node = self._get_node_by_id(player.location_id)
         player.actions_left = 4 
-        logging.info(f"Player Status: {player.__dict__}")
-        logging.info(f"Node status: {node.__dict__}")
+        if self.log_enabled:
+            self.logger.info(f"Start action phase.")
+            self.logger.info(f"Player Status: {player.__dict__}")
+            self.logger.info(f"Node status: {node.__dict__}")
         
 
+        # the actions of passive turns are not logged either, so the fast path is only taken without logging
+        if fast_forward_passive_turns and not self.log_enabled and self.agent is not None and self.agent.skip_passive_turn(self.active_player_id, player.actions_left):
+            player.actions_left = 0
+            if self._get_node_by_id(self.end_node_id).freight >= self.target_freight:
+                raise GameWonException()
+            return
+        # one request for all decisions of the turn, the active player does not change
+        request = DecisionRequest(self, self.active_player_id)
         while player.actions_left > 0:
-            if self.agent:
-                try: 
-                    action = self.agent.get_next_action_for_player(self.active_player_id)
-                    action.run()
-                except InvalidActionException as e:
-                    logging.warning(f"Invalid Action {action.action.__name__}. Doing nothing instead.")   
-                    self.agent.action_queues[self.active_player_id] = []
-                    PlayerAction(self, self.active_player_id, ACTIONS[DO_NOTHING_ACTION_NAME]) 
-                finally:
-                    player.actions_left -= 1
-            # if no agent is set up, random actions can be chosen by uncommenting this section 
-            #else:
-            #    vpa = get_valid_player_actions(self, player.id)
-            #    vpa[random.randint(0, len(vpa)-1)].run()
-            #    player.actions_left -= 1
+            try: 
+                action = yield request
+                run_action(self, self.active_player_id, action)
+            except InvalidActionException as e:
+                if self.log_enabled:
+                    self.logger.warning(f"Invalid Action {get_action_name(action)}. Doing nothing instead.")
+                self.invalid_actions += 1
+                if self.agent is not None:
+                    self.agent.reset_plan(self.active_player_id)
+            finally:
+                player.actions_left -= 1
         # check win condition
             if self._get_node_by_id(self.end_node_id).freight >= self.target_freight:
                 raise GameWonException()
@@ -223,18 +380,25 @@ class Game():
     def resupply_phase(self) -> None: 
         """Play the resupply phase.
         """
-        logging.info(f"Start resupply phase.")
+        if self.log_enabled:
+            self.logger.info(f"Start resupply phase.")
         self.draw_player_card()
 
     def damage_phase(self) -> None: 
-        """Play the damage phase.
-        """
-        logging.info(f"Start damage phase.")
-        destruction_level_to_card_draw_mapping = {0:1, 1:1, 2:2, 3:2, 4:3}
-        card_draw_due_to_descruction = destruction_level_to_card_draw_mapping[self.destruction_level]
-        logging.info(f"Draw {card_draw_due_to_descruction} cards due to destruction level {self.destruction_level}.")
-        for i in range(0, card_draw_due_to_descruction):
-            self.draw_damage_card()
+        """Play the damage phase. The cards are drawn from the top with the same helper as draw_damage_card, but without its per-draw checks of the arguments
+        and the stack, whether logging is enabled or not. The individual draws are only logged if logging is enabled.
+        """
+        card_draw_due_to_descruction = DESTRUCTION_LEVEL_TO_DAMAGE_CARD_DRAWS[self.destruction_level]
+        if self.log_enabled:
+            self.logger.info(f"Start damage phase.")
+            self.logger.info(f"Draw {card_draw_due_to_descruction} cards due to destruction level {self.destruction_level}.")
+        # drawing does not restock the stack, so the number of cards that can be drawn is known in advance
+        cards_to_draw = min(card_draw_due_to_descruction, len(self.damage_cards))
+        for i in range(0, cards_to_draw):
+            self._draw_damage_card(from_top=True, damage_to_node=1)
+        if self.log_enabled:
+            for i in range(cards_to_draw, card_draw_due_to_descruction):
+                self.logger.info(EMPTY_DAMAGE_CARD_STACK_MESSAGE)
     
     def draw_player_card(self, draw_from:str = 'top') -> None: 
         """Draws a player card for the active player. 
@@ -251,24 +415,31 @@ class Game():
            raise ValueError("from parameter must be 'top' or 'bottom'.") 
         if len(self.player_cards) == 0:
             raise GameLostException(GAME_LOST_STR_CARDS)
-        if draw_from is "top":
+        if draw_from == "top":
             card = self.player_cards.pop()
         else:
             card = self.player_cards.pop(0)
-        logging.info(f"Player {player.name} draws ({card}) from the {draw_from} of the player card stack.")
         self.player_cards_discards.append(card)
-
         if card == 1:
             player.funds +=1
-            logging.info(f"Player {player.name} receives 1 fund (now has {player.funds}).")
         else:
             self.destruction_level += 1
-            logging.info(f"Destrution level increased to {self.destruction_level}. Drawing a damage card.")
+        if self.log_enabled:
+            self.logger.info(f"Player {player.name} draws ({card}) from the {draw_from} of the player card stack.")
+            if card == 1:
+                self.logger.info(f"Player {player.name} receives 1 fund (now has {player.funds}).")
+            else:
+                self.logger.info(f"Destrution level increased to {self.destruction_level}. Drawing a damage card.")
+
+        if card != 1:
             self.draw_damage_card(damage_to_node=3)
-            random.shuffle(self.damage_cards_discards)
+            self.random.shuffle(self.damage_cards_discards)
+            if len(self.damage_cards_discards) > 0:
+                self.damage_card_segments.append(len(self.damage_cards_discards))
             self.damage_cards += self.damage_cards_discards
             self.damage_cards_discards = [] 
-            logging.info(f"Shuffle damage card discard stack and put it on top of the damage card stack.")
+            if self.log_enabled:
+                self.logger.info(f"Shuffle damage card discard stack and put it on top of the damage card stack.")
                
     def draw_damage_card(self, draw_from:str = 'top', damage_to_node:int=1) -> None: 
         """Draws a damage card for the active player.
@@ -280,21 +451,46 @@ class Game():
         Raises:
             ValueError: [description]
         """
-        player = self._get_player_by_id(self.active_player_id)
         if draw_from not in ['top', 'bottom']:
             raise ValueError("from parameter must be 'top' or 'bottom'.")     
-        try:
-            if draw_from is "top":
-                card = self.damage_cards.pop()
-            else:
-                card = self.damage_cards.pop(0)
-            self.damage_cards_discards.append(card)
-            logging.info(f"Player {player.name} draws ({card}) from the {draw_from} of the damage card stack.")
-            if card is not 0:
-                self._add_damage_to_node(node_id=card, damage_value=damage_to_node)
-        except IndexError:
-            logging.info("The damage card stack is empty. The next time the damage card are restocked, a card will be drawn and 3 damage points will be added to that note.")
-        
+        if len(self.damage_cards) == 0:
+            if self.log_enabled:
+                self.logger.info(EMPTY_DAMAGE_CARD_STACK_MESSAGE)
+            return
+        self._draw_damage_card(from_top=draw_from == "top", damage_to_node=damage_to_node)
+
+    def _draw_damage_card(self, from_top:bool, damage_to_node:int) -> None:
+        """Internally called to draw a card from the non-empty damage card stack and apply its damage. The rules of a damage card draw, used by draw_damage_card and damage_phase.
+
+        Args:
+            from_top (bool): Draw from the top of the stack, otherwise from the bottom.
+            damage_to_node (int): Number of damage points that will be applied to the drawn node.
+        """
+        card = self.damage_cards.pop() if from_top else self.damage_cards.pop(0)
+        self._remove_damage_card_from_segments(from_top=from_top)
+        self.damage_cards_discards.append(card)
+        if self.log_enabled:
+            player = self._get_player_by_id(self.active_player_id)
+            self.logger.info(f"Player {player.name} draws ({card}) from the {'top' if from_top else 'bottom'} of the damage card stack.")
+        if card != 0:
+            self._add_damage_to_node(node_id=card, damage_value=damage_to_node)
+
+
+
+class DecisionRequest():
+    """Yielded by the step generators of a Game whenever a player has to choose an action. The generator expects a PlayerAction or a compact action (see boardgame.player_actions.compact_action) of that player to be sent back.
+    The same request object is yielded for all decisions of a turn.
+    """
+    def __init__(self, game:Game, player_id:int) -> None:
+        """Constructor of boardgame.classes.DecisionRequest
+
+        Args:
+            game (Game): The game that waits for the decision.
+            player_id (int): Id of the active player.
+        """
+        self.game = game
+        self.player_id = player_id
+
     
 class Node(): 
     """Represents a node on the game board.
@@ -312,15 +508,69 @@ class Node():
         self.name = name
         self.node_type = node_type
         self.neighbors = neighbors
+        self._damaged_node_ids = None
+        self._freight_node_ids = None
         self.damage = 0 
         self.freight = 0
         self.affected_by_cascade = False      
 
+    def _copy(self, damaged_node_ids:set[int], freight_node_ids:set[int]) -> Node:
+        """Internally called to create a node of a new game from an untracked template node without damage and freight.
+
+        Args:
+            damaged_node_ids (set[int]): Set of damaged node ids of the new game.
+            freight_node_ids (set[int]): Set of node ids with freight of the new game.
+
+        Returns:
+            Node: New node with the same fields, registered with the given sets.
+        """
+        node = Node.__new__(Node)
+        node.__dict__.update(self.__dict__)
+        node._damaged_node_ids = damaged_node_ids
+        node._freight_node_ids = freight_node_ids
+        return node
+
+    def _track(self, damaged_node_ids:set[int], freight_node_ids:set[int]) -> None:
+        """Internally called by the game to register the sets that contain the ids of all damaged nodes and all nodes with freight units.
+
+        Args:
+            damaged_node_ids (set[int]): Set that contains this node's id while it has damage.
+            freight_node_ids (set[int]): Set that contains this node's id while it has freight units.
+        """
+        self._damaged_node_ids = damaged_node_ids
+        self._freight_node_ids = freight_node_ids
+        self.damage = self._damage
+        self.freight = self._freight
+
+    @property
+    def damage(self) -> int:
+        return self._damage
+
+    @damage.setter
+    def damage(self, value:int) -> None:
+        self._damage = value
+        if self._damaged_node_ids is not None:
+            if value > 0:
+                self._damaged_node_ids.add(self.id)
+            else:
+                self._damaged_node_ids.discard(self.id)
+
+    @property
+    def freight(self) -> int:
+        return self._freight
+
+    @freight.setter
+    def freight(self, value:int) -> None:
+        self._freight = value
+        if self._freight_node_ids is not None:
+            if value > 0:
+                self._freight_node_ids.add(self.id)
+            else:
+                self._freight_node_ids.discard(self.id)
+
 class Player():
     """Represents a player on the game board.
     """
-    id_counter = 0    
-
     def __init__(self, id:int, type:str, location_id:int=1, funds:int=0) -> None:
         """Constructor for boardgame.classes.Player
 
@@ -336,9 +586,6 @@ class Player():
         self.location_id = location_id
         self.funds = funds
         self.actions_left = 4 
-
-        # automatic ID does not really work with jupyter notebooks, because the kernel remembers the increment
-        Player.id_counter += 1        
     
     def __dir__(self) -> list:
         """Implementation for serialization and logging
@@ -349,47 +596,94 @@ class Player():
         return ['id', 'name', 'type', 'location_id', 'funds', 'actions_left']
 
 
-def _load_nodes_from_json(path_to_json:str = "boardgame/res/map.json") -> list[Node]: 
+# map entries and adjacency per map file, filled on first use or by boardgame.workers.init_worker. Cached maps are never modified.
+_MAP_CACHE:dict[str, tuple[list[dict], CSRGraph]] = {}
+_MAP_CACHE_LOCK = threading.Lock()
+
+def _load_map(path_to_json:str = DEFAULT_MAP_PATH) -> tuple[list[dict], CSRGraph]:
+        """Loads the entries of a json map file and builds its adjacency. Each file is only parsed once per process.
+
+        Args:
+            path_to_json (str, optional): Path to the map file. Defaults to res/map.json.
+
+        Returns:
+            tuple[list[dict], CSRGraph]: Map entries and adjacency of the map.
+        """
+        key = os.path.abspath(path_to_json)
+        if key not in _MAP_CACHE:
+            with _MAP_CACHE_LOCK:
+                if key not in _MAP_CACHE:
+                    import json
+                    with open(path_to_json) as f:
+                        entries = json.load(f)
+                    _MAP_CACHE[key] = (entries, CSRGraph.from_nodes([Node(**entry) for entry in entries]))
+        return _MAP_CACHE[key]
+
+class _GameTemplate():
+    """Internally used to hold the parts of a new game that only depend on the map and the end node. Never modified after construction.
+    """
+    def __init__(self, path_to_map:str, target_end_node:int) -> None:
+        entries, self.graph = _load_map(path_to_map)
+        self.nodes = tuple(Node(**entry) for entry in entries)
+        self.damage_card_node_ids = tuple(node.id for node in self.nodes if node.node_type != 'purple')
+        self.distances_to_end = self.graph.distances_from(target_end_node)
+        self.compact_actions = intern_compact_actions([node.id for node in self.nodes])
+
+# template per (map path, end node), filled on first use or by boardgame.workers.init_worker. Scenarios that only differ in other parameters share a template,
+# so the cache does not grow with the number of swept parameter points.
+_TEMPLATE_CACHE:dict[tuple[str, int], _GameTemplate] = {}
+
+def _get_template(scenario:Scenario) -> _GameTemplate:
+        """Internally called to get the template of a scenario. Two threads may build the same template at once, both results are equal.
+        """
+        key = (scenario.path_to_map, scenario.target_end_node)
+        template = _TEMPLATE_CACHE.get(key)
+        if template is None:
+            template = _TEMPLATE_CACHE.setdefault(key, _GameTemplate(*key))
+        return template
+
+def _load_nodes_from_json(path_to_json:str = DEFAULT_MAP_PATH) -> list[Node]: 
         """Loads a list of nodes from a json file
 
         Args:
-            path_to_json (str, optional): [description]. Defaults to "boardgame/map.json".
+            path_to_json (str, optional): Path to the map file. Defaults to res/map.json.
 
         Returns:
-            list[Node]: [description]
+            list[Node]: New node objects for the map.
         """
-        with open(path_to_json) as f:
-           data = json.load(f)
-        result = [] 
-        for entry in data: 
-            result.append(Node(**entry))
-        return result
+        return [Node(**entry) for entry in _load_map(path_to_json)[0]]
 
-def _create_and_shuffle_damage_cards(node_indices:list(int)=None, number_of_jokers:int = 4) -> list[int]:
+def _create_and_shuffle_damage_cards(node_indices:list(int)=None, number_of_jokers:int = 4, rng:random.Random = random) -> list[int]:
     """Emulate a shuffled standard deck of 1 to 21 with two jokers (=0) and only one color
 
+    Args:
+            node_indices (list[int], optional): Node ids of the cards. Defaults to the ids 1 to 18.
+            number_of_jokers (int, optional): Number of jokers. Defaults to 4.
+            rng (random.Random, optional): Random number generator of the game. Defaults to the module random.
+
     Returns:
             list[int]: shuffled standard deck of 23 cards
     """
     damage_cards = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18] if not node_indices else node_indices
     damage_cards + [0 for i in range(number_of_jokers)]
-    random.shuffle(damage_cards)
+    rng.shuffle(damage_cards)
     return damage_cards
 
-def _create_and_shuffle_player_cards(number_of_fund_cards:int = 56, number_of_damage_cards:int = 4) -> list[int]: 
+def _create_and_shuffle_player_cards(number_of_fund_cards:int = 56, number_of_damage_cards:int = 4, rng:random.Random = random) -> list[int]: 
     """Shuffle damage cards (0) into fund cards in such a way that they can only occur one time for each step_size 
 
      Args:
             number_of_fund_cards (int, optional): [description]. Defaults to 56.
             number_of_damage_cards (int, optional): [description]. Defaults to 4.
+            rng (random.Random, optional): Random number generator of the game. Defaults to the module random.
 
      Returns:
             list[int]: list where 1 represents a fund card and 0 represents a damage card. 
     """
-    player_cards = [1 for x in range(number_of_fund_cards)]
-    step_size = math.ceil(number_of_fund_cards / number_of_damage_cards)
+    player_cards = [1] * number_of_fund_cards
+    step_size = -(-number_of_fund_cards // number_of_damage_cards)
     for x in range(0,number_of_damage_cards): 
-        player_cards.insert(random.randint(x * step_size, (x+1) * step_size),0)
+        player_cards.insert(rng.randint(x * step_size, (x+1) * step_size),0)
     return player_cards
 
 class GameLostException(Exception):
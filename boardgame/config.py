@@ -20,8 +20,13 @@ ALLOWED_ACTIONS_DRIVER = ALLOWED_ACTIONS + [SHARE_RESOURCES_ACTION_NAME, REPAIR_
 ALLOWED_ACTIONS_INDUSTRY = ALLOWED_ACTIONS + [GENERATE_GOODS_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME]
 ALLOWED_ACTIONS_INVESTOR = ALLOWED_ACTIONS + [SHARE_RESOURCES_ACTION_NAME, COORDINATE_DRIVERS_ACTION_NAME]
 
+# number of damage cards drawn in the damage phase for each destruction level
+DESTRUCTION_LEVEL_TO_DAMAGE_CARD_DRAWS = {0:1, 1:1, 2:2, 3:2, 4:3}
+
 GAME_LOST_STR_CASCADE="CASCADE"
 GAME_LOST_STR_CARDS="PLAYER-CARDS"
+# reason of games that were terminated early because they could not be won anymore, the reason of the full game is unknown
+GAME_LOST_STR_UNWINNABLE="UNWINNABLE"
 
 # parameter 
 
@@ -34,4 +39,31 @@ CASCADE_DAMAGE_THRESHOLD = 3
 
 NUMBER_OF_FUND_CARDS = 56
 NUMBER_OF_DESTRUCTION_CARDS = 4
-NUMBER_OF_DAMAGE_CARD_JOKERS = 4
\ No newline at end of file
+NUMBER_OF_DAMAGE_CARD_JOKERS = 4
+
+# agent heuristic parameters, the defaults reproduce the original hard-coded strategy 
+
+# damage bonus of nodes on the lane when drivers choose a repair target (large values: always repair the lane first)
+AGENT_LANE_REPAIR_BONUS = 1000
+# drivers ignore nodes with less damage
+AGENT_MIN_REPAIR_DAMAGE = 1
+# drivers skip the target of the other driver if there are other damaged nodes
+AGENT_AVOID_SHARED_REPAIR_TARGET = False
+# industry generates freight units until target amount + extra freight units are in the game
+AGENT_INDUSTRY_EXTRA_FREIGHT = 0
+# funds the industry keeps in addition to the generation costs
+AGENT_INDUSTRY_FUNDS_RESERVE = 0
+# investors share funds with a player at the same node if they have more funds (large values: never share)
+AGENT_INVESTOR_SHARE_THRESHOLD = 1000
+# investors follow the industry player to be able to share funds with it
+AGENT_INVESTOR_FOLLOWS_INDUSTRY = False
+
+AGENT_PARAMETERS = {
+    'lane_repair_bonus': AGENT_LANE_REPAIR_BONUS,
+    'min_repair_damage': AGENT_MIN_REPAIR_DAMAGE,
+    'avoid_shared_repair_target': AGENT_AVOID_SHARED_REPAIR_TARGET,
+    'industry_extra_freight': AGENT_INDUSTRY_EXTRA_FREIGHT,
+    'industry_funds_reserve': AGENT_INDUSTRY_FUNDS_RESERVE,
+    'investor_share_threshold': AGENT_INVESTOR_SHARE_THRESHOLD,
+    'investor_follows_industry': AGENT_INVESTOR_FOLLOWS_INDUSTRY,
+}
@@ -0,0 +1,279 @@
+"""Sweeps over several machines through a work queue in a shared directory (e.g. an NFS mount, or a local directory for several processes on one host).
+
+The coordinator splits a sweep into work units of one parameter point and a range of seeds and writes them to the directory. Workers claim units by an atomic
+rename, which works as a lease: a worker refreshes the modification time of its lease after every game, and the coordinator returns units whose lease is
+older than the lease timeout to the queue, e.g. after a worker was stopped or lost its machine. Results are written per unit and merged by the coordinator.
+Games are deterministic per seed, so a unit that is played twice gives identical results and the first result wins.
+
+Layout of the directory:
+
+    pending/<unit>.json           units waiting for a worker
+    leased/<unit>.<worker>.json   units claimed by a worker
+    results/<unit>.json           result dictionaries of finished units
+    errors/<unit>.<worker>.txt    traceback of a unit that raised an exception
+    STOP                          created by the coordinator when the sweep is complete
+
+Command line usage, with one coordinator and any number of workers on any machines that share the directory:
+
+    python -m boardgame.distributed coordinator /shared/sweep --grid '{"cascade_max_level": [8, 10]}' --seeds 1 1001 --output results.json
+    python -m boardgame.distributed worker /shared/sweep
+"""
+from __future__ import annotations
+from boardgame.sweep import parameter_points, play_game_with_parameters
+import json
+import os
+import socket
+import time
+
+STOP_FILE = "STOP"
+_PENDING = "pending"
+_LEASED = "leased"
+_RESULTS = "results"
+_ERRORS = "errors"
+
+
+def _write_json_atomic(path:str, content) -> None:
+    """Internally called to write a file that readers never see half written.
+    """
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump(content, f)
+    os.replace(temporary_path, path)
+
+
+def _make_directories(directory:str) -> None:
+    """Internally called to create the queue layout in a directory.
+    """
+    for name in (_PENDING, _LEASED, _RESULTS, _ERRORS):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+
+class SweepCoordinator():
+    """Splits a sweep into work units, requeues units with expired leases or errors and merges the results.
+    """
+    def __init__(self, directory:str, parameter_grid:dict[str, list], random_seeds:list[int], agent_kwargs:dict = None, seeds_per_unit:int = 50, lease_timeout:float = 60, max_attempts:int = 3) -> None:
+        """Constructor of boardgame.distributed.SweepCoordinator
+
+        Args:
+            directory (str): Queue directory shared with the workers. The files of an earlier sweep in the directory are removed by submit, so its workers must have exited.
+            parameter_grid (dict[str, list]): Values per game parameter, see Game.
+            random_seeds (list[int]): Random seeds played for every combination.
+            agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+            seeds_per_unit (int, optional): Number of seeds per work unit. Defaults to 50.
+            lease_timeout (float, optional): Seconds without progress after which a leased unit is handed out again. Must be longer than a single game. Defaults to 60.
+            max_attempts (int, optional): Number of times a unit is handed out before the sweep fails. Defaults to 3.
+        """
+        self.directory = directory
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        random_seeds = list(random_seeds)
+        chunks = [random_seeds[i:i + seeds_per_unit] for i in range(0, len(random_seeds), seeds_per_unit)]
+        self.units = {}
+        for game_kwargs in parameter_points(parameter_grid):
+            for chunk in chunks:
+                unit_id = f"{len(self.units):06d}"
+                self.units[unit_id] = {"unit_id": unit_id, "game_kwargs": game_kwargs, "agent_kwargs": agent_kwargs or {}, "random_seeds": chunk}
+        self.attempts = {unit_id: 1 for unit_id in self.units}
+        self.results:dict[str, list[dict]] = {}
+
+    def submit(self) -> None:
+        """Write all work units to the queue. The files left by an earlier sweep in the same directory are removed first: its results would be taken for the
+        results of the units with the same ids, and its STOP file would make the workers exit at once.
+        """
+        _make_directories(self.directory)
+        stale_paths = [self._path(name, file_name) for name in (_PENDING, _LEASED, _RESULTS, _ERRORS) for file_name in os.listdir(self._path(name))]
+        for path in stale_paths + [self._path(STOP_FILE)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        for unit_id, unit in self.units.items():
+            _write_json_atomic(self._path(_PENDING, f"{unit_id}.json"), unit)
+
+    def poll(self) -> bool:
+        """Collect finished units and requeue units whose lease expired or whose worker reported an error.
+
+        Raises:
+            RuntimeError: If a unit failed max_attempts times.
+
+        Returns:
+            bool: True if all units are finished.
+        """
+        for file_name in os.listdir(self._path(_RESULTS)):
+            unit_id = file_name.split(".")[0]
+            if file_name.endswith(".json") and unit_id not in self.results:
+                with open(self._path(_RESULTS, file_name)) as f:
+                    self.results[unit_id] = json.load(f)
+        now = time.time()
+        for file_name in os.listdir(self._path(_LEASED)):
+            unit_id = file_name.split(".")[0]
+            path = self._path(_LEASED, file_name)
+            try:
+                expired = now - os.path.getmtime(path) > self.lease_timeout
+            except FileNotFoundError:
+                # the worker finished in the meantime
+                continue
+            if unit_id in self.results:
+                continue
+            if expired:
+                self._requeue(unit_id, f"lease {file_name} expired")
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        for file_name in os.listdir(self._path(_ERRORS)):
+            unit_id = file_name.split(".")[0]
+            path = self._path(_ERRORS, file_name)
+            with open(path) as f:
+                error = f.read()
+            os.remove(path)
+            if unit_id not in self.results:
+                self._requeue(unit_id, error)
+        return len(self.results) == len(self.units)
+
+    def run(self, poll_interval:float = 0.5, timeout:float = None) -> list[dict]:
+        """Submit the work units, wait until all are finished and tell the workers to stop.
+
+        Args:
+            poll_interval (float, optional): Seconds between two polls of the directory. Defaults to 0.5.
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None, i.e. no limit.
+
+        Raises:
+            TimeoutError: If the sweep is not finished within the timeout.
+            RuntimeError: If a unit failed max_attempts times.
+
+        Returns:
+            list[dict]: Merged results, see merged_results.
+        """
+        start = time.perf_counter()
+        self.submit()
+        while not self.poll():
+            if timeout is not None and time.perf_counter() - start > timeout:
+                raise TimeoutError(f"{len(self.units) - len(self.results)} of {len(self.units)} work units are not finished.")
+            time.sleep(poll_interval)
+        self.stop()
+        return self.merged_results()
+
+    def stop(self) -> None:
+        """Tell all workers to exit once they are idle.
+        """
+        open(self._path(STOP_FILE), "w").close()
+
+    def merged_results(self) -> list[dict]:
+        """Get the results of all finished units.
+
+        Returns:
+            list[dict]: Result dictionaries with the additional fields "random_seed" and one field per swept parameter, ordered by combination and seed as in boardgame.sweep.run_sweep.
+        """
+        return [result for unit_id in sorted(self.results) for result in self.results[unit_id]]
+
+    def _requeue(self, unit_id:str, reason:str) -> None:
+        """Internally called to hand out a unit again.
+        """
+        if self.attempts[unit_id] >= self.max_attempts:
+            raise RuntimeError(f"Work unit {unit_id} failed {self.attempts[unit_id]} times, last reason: {reason}")
+        self.attempts[unit_id] += 1
+        _write_json_atomic(self._path(_PENDING, f"{unit_id}.json"), self.units[unit_id])
+
+    def _path(self, *names:str) -> str:
+        return os.path.join(self.directory, *names)
+
+
+def _claim_unit(directory:str, worker_id:str) -> tuple[dict, str]:
+    """Internally called to lease the next pending unit. Returns (None, None) if no unit is pending.
+    """
+    for file_name in sorted(os.listdir(os.path.join(directory, _PENDING))):
+        if not file_name.endswith(".json"):
+            continue
+        unit_id = file_name.split(".")[0]
+        lease_path = os.path.join(directory, _LEASED, f"{unit_id}.{worker_id}.json")
+        try:
+            # only one worker can rename the file, the others try the next unit
+            os.rename(os.path.join(directory, _PENDING, file_name), lease_path)
+        except FileNotFoundError:
+            continue
+        # the rename keeps the modification time of the pending file, the lease starts now
+        os.utime(lease_path)
+        with open(lease_path) as f:
+            return json.load(f), lease_path
+    return None, None
+
+
+def run_worker(directory:str, worker_id:str = None, poll_interval:float = 0.5, idle_timeout:float = None) -> int:
+    """Process work units from a queue directory until the coordinator creates the STOP file.
+
+    Args:
+        directory (str): Queue directory shared with the coordinator.
+        worker_id (str, optional): Unique name of the worker. Defaults to host name and process id.
+        poll_interval (float, optional): Seconds between two polls while no unit is pending. Defaults to 0.5.
+        idle_timeout (float, optional): Exit after this many seconds without work. Defaults to None, i.e. wait for the STOP file.
+
+    Returns:
+        int: Number of processed units.
+    """
+    import traceback
+    worker_id = (worker_id or f"{socket.gethostname()}-{os.getpid()}").replace(".", "-")
+    _make_directories(directory)
+    processed_units = 0
+    idle_since = time.perf_counter()
+    while not os.path.exists(os.path.join(directory, STOP_FILE)):
+        unit, lease_path = _claim_unit(directory, worker_id)
+        if unit is None:
+            if idle_timeout is not None and time.perf_counter() - idle_since > idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+        try:
+            results = []
+            for random_seed in unit["random_seeds"]:
+                result = play_game_with_parameters(random_seed, unit["game_kwargs"], unit["agent_kwargs"])
+                result.update(unit["game_kwargs"])
+                results.append(result)
+                # renew the lease
+                os.utime(lease_path)
+            _write_json_atomic(os.path.join(directory, _RESULTS, f"{unit['unit_id']}.json"), results)
+        except FileNotFoundError:
+            # the lease expired and the coordinator took the unit back
+            pass
+        except Exception:
+            with open(os.path.join(directory, _ERRORS, f"{unit['unit_id']}.{worker_id}.txt"), "w") as f:
+                f.write(traceback.format_exc())
+        try:
+            os.remove(lease_path)
+        except FileNotFoundError:
+            pass
+        processed_units += 1
+        idle_since = time.perf_counter()
+    return processed_units
+
+
+def main(arguments:list[str] = None) -> None:
+    """Command line interface, see the module documentation.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m boardgame.distributed", description="Distributed parameter sweeps through a shared queue directory.")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+    coordinator_parser = subparsers.add_parser("coordinator", help="split a sweep into work units and merge the results")
+    coordinator_parser.add_argument("directory")
+    coordinator_parser.add_argument("--grid", required=True, help="parameter grid as JSON, e.g. '{\"cascade_max_level\": [8, 10]}'")
+    coordinator_parser.add_argument("--seeds", nargs=2, type=int, default=[1, 101], metavar=("FIRST", "STOP"), help="range of random seeds, the second value is excluded")
+    coordinator_parser.add_argument("--agent", default="{}", help="agent heuristic parameters as JSON")
+    coordinator_parser.add_argument("--seeds-per-unit", type=int, default=50)
+    coordinator_parser.add_argument("--lease-timeout", type=float, default=60)
+    coordinator_parser.add_argument("--max-attempts", type=int, default=3)
+    coordinator_parser.add_argument("--output", required=True, help="path of the merged results as JSON")
+    worker_parser = subparsers.add_parser("worker", help="process work units until the coordinator is done")
+    worker_parser.add_argument("directory")
+    worker_parser.add_argument("--worker-id")
+    worker_parser.add_argument("--idle-timeout", type=float)
+    args = parser.parse_args(arguments)
+
+    if args.role == "coordinator":
+        coordinator = SweepCoordinator(args.directory, json.loads(args.grid), range(*args.seeds), json.loads(args.agent), args.seeds_per_unit, args.lease_timeout, args.max_attempts)
+        _write_json_atomic(args.output, coordinator.run())
+    else:
+        run_worker(args.directory, args.worker_id, idle_timeout=args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+"""Exact endgame solver and endgame oracle for agents.
+
+The solver computes the win probability of a game by expectimax search over a compact, hashable state. All players cooperate, so every action is chosen to
+maximize the win probability. Card draws are chance events under the information the players have:
+
+* player cards: Game inserts one destruction card into each window of the fund cards (see _create_and_shuffle_player_cards), so the chance of a destruction
+  card depends on the draws at which the destruction cards so far were drawn, see destruction_card_probability. A stack that was not dealt by these rules,
+  e.g. changed by hand, is treated as a uniformly shuffled mix of the remaining fund and destruction cards,
+* damage cards: each part of the damage card stack that was shuffled separately (see Game.damage_card_segments) is uniformly shuffled, cards are drawn from the top part first.
+
+The rules are those of boardgame.player_actions and boardgame.classes.Game. Special flights and coordinating drivers are not considered, because they never change the state.
+The search tree is finite because every turn draws a player card, so the solver is meant for the end of a game when only few player cards are left.
+Evaluated states are memoized in a bounded cache, and a time limit makes sure a call never stalls a sweep.
+
+    solver = EndgameSolver(game, time_limit=5)
+    probability, action = solver.best_action()
+"""
+from __future__ import annotations
+from boardgame.config import DESTRUCTION_LEVEL_TO_DAMAGE_CARD_DRAWS, DO_NOTHING_ACTION_NAME, FLY_ACTION_NAME, GENERATE_GOODS_ACTION_NAME, PLAYER_TYPE_DRIVER, PLAYER_TYPE_INDUSTRY, PLAYER_TYPE_INVESTOR, REPAIR_ACTION_NAME, RUN_ACTION_NAME, SHARE_RESOURCES_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME
+from boardgame.player_actions import ACTIONS, PlayerAction
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+import math
+import time
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.classes import Game
+
+# positions of the fields in a compact state
+DAMAGE, FREIGHT, LOCATIONS, FUNDS, ACTIVE_PLAYER, ACTIONS_LEFT, DESTRUCTION_LEVEL, CASCADE_LEVEL, FUND_CARDS, DESTRUCTION_CARDS, DESTRUCTION_DRAWS, DAMAGE_CARD_SEGMENTS, DAMAGE_CARD_DISCARDS = range(13)
+
+# the solver checks the time limit every time this many states have been expanded
+TIME_CHECK_INTERVAL = 256
+# win probabilities from this value on are treated as a sure win, which allows to stop searching despite rounding errors of the chance nodes
+CERTAIN_WIN = 1.0 - 1e-9
+
+
+class SolverLimitExceeded(Exception):
+    """Raised when the solver exceeds its time limit.
+    """
+    def __init__(self, message:str = "Time limit of the endgame solver exceeded"):
+        self.message = message
+
+
+class _CascadeLost(Exception):
+    """Internally raised when a cascade exceeds the maximum cascade level.
+    """
+
+
+def minimum_industry_actions(freight:dict[int, int], distances_to_end:dict[int, int], start_node_id:int, end_node_id:int, target_freight:int) -> int:
+    """Lower bound of the action points the industry player needs to win: every missing freight unit has to be transported along its shortest path to the end node,
+    new units additionally have to be generated at the start node. Movement without freight, funds and damage are ignored.
+
+    Args:
+        freight (dict[int, int]): Number of freight units per node id (nodes without freight may be missing).
+        distances_to_end (dict[int, int]): Hop distance of each node id to the end node.
+        start_node_id (int): Id of the node where freight units are generated.
+        end_node_id (int): Id of the target node.
+        target_freight (int): Number of freight units needed at the end node.
+
+    Returns:
+        int: Minimum number of action points, or a very large number if the end node cannot be reached.
+    """
+    missing = target_freight - freight.get(end_node_id, 0)
+    if missing <= 0:
+        return 0
+    unreachable = 1 << 30
+    costs = sorted(distances_to_end.get(node_id, unreachable) for node_id, units in freight.items() if node_id != end_node_id for _ in range(units))[:missing]
+    new_unit_cost = 1 + distances_to_end.get(start_node_id, unreachable)
+    return sum(min(cost, new_unit_cost) for cost in costs) + new_unit_cost * (missing - len(costs))
+
+
+def available_industry_actions(player_types:list[str], active_index:int, actions_left:int, remaining_player_cards:int) -> int:
+    """Upper bound of the action points the industry players get before the player cards run out. Every turn draws one player card, so the current turn
+    and one turn per remaining card still have an action phase.
+
+    Args:
+        player_types (list[str]): Types of the players in the order of their turns.
+        active_index (int): Index of the active player in player_types.
+        actions_left (int): Action points the active player has left in the current turn.
+        remaining_player_cards (int): Number of cards on the player card stack.
+
+    Returns:
+        int: Number of action points of all industry players, including the ones left in the current turn.
+    """
+    number_of_players = len(player_types)
+    available = 0
+    for index, player_type in enumerate(player_types):
+        if player_type != PLAYER_TYPE_INDUSTRY:
+            continue
+        if index == active_index:
+            available += actions_left
+        # turns 1 to remaining_player_cards after the current one still have an action phase
+        turns_ahead = (index - active_index) % number_of_players or number_of_players
+        if turns_ahead <= remaining_player_cards:
+            available += 4 * ((remaining_player_cards - turns_ahead) // number_of_players + 1)
+    return available
+
+
+def destruction_card_probability(number_of_fund_cards:int, number_of_destruction_cards:int, destruction_draws:tuple[int, ...], drawn_cards:int) -> float:
+    """Probability that the next player card is a destruction card, for a stack dealt by _create_and_shuffle_player_cards and drawn from the top.
+
+    Args:
+        number_of_fund_cards (int): Number of fund cards the stack was dealt with.
+        number_of_destruction_cards (int): Number of destruction cards the stack was dealt with.
+        destruction_draws (tuple[int, ...]): Draws (counted from 0) at which a destruction card was drawn so far, in increasing order.
+        drawn_cards (int): Number of cards drawn so far.
+
+    Returns:
+        float: Probability of a destruction card, or NaN if the draws so far are not possible with this stack.
+    """
+    so_far = _top_cards_probability(number_of_fund_cards, number_of_destruction_cards, tuple(destruction_draws), drawn_cards)
+    if so_far == 0:
+        return math.nan
+    return _top_cards_probability(number_of_fund_cards, number_of_destruction_cards, tuple(destruction_draws) + (drawn_cards,), drawn_cards + 1) / so_far
+
+
+@lru_cache(maxsize=4096)
+def _top_cards_probability(number_of_fund_cards:int, number_of_destruction_cards:int, destruction_draws:tuple[int, ...], drawn_cards:int) -> float:
+    """Internally called to get the probability that the top drawn_cards cards of a stack have destruction cards exactly at destruction_draws.
+
+    Destruction card x is inserted at a uniform position p_x of its window [x * step, (x + 1) * step]. Its final index in the stack is max(p_x, r + 1), where r is
+    the final index of destruction card x - 1, so the distribution of r is carried from window to window.
+    """
+    step = -(-number_of_fund_cards // number_of_destruction_cards)
+    total = number_of_fund_cards + number_of_destruction_cards
+    # the top card is the last one of the stack
+    drawn_indices = sorted(total - 1 - draw for draw in destruction_draws)
+    undrawn = number_of_destruction_cards - len(drawn_indices)
+    if undrawn < 0:
+        return 0.0
+    # final index of the previous destruction card -> probability
+    distribution = {-1: 1.0}
+    for x in range(number_of_destruction_cards):
+        positions = range(x * step, (x + 1) * step + 1)
+        next_distribution = {}
+        for previous, probability in distribution.items():
+            for position in positions:
+                index = max(position, previous + 1)
+                # the first destruction cards are still on the stack, the others were drawn at the given draws
+                if x < undrawn:
+                    possible = index < total - drawn_cards
+                else:
+                    possible = index == drawn_indices[x - undrawn]
+                if possible:
+                    next_distribution[index] = next_distribution.get(index, 0.0) + probability / len(positions)
+        distribution = next_distribution
+    return sum(distribution.values())
+
+
+class EndgameSolver():
+    """Expectimax solver for the win probability of a game. The static parts of the game (board, rules and parameters) are taken from the game at construction,
+    the dynamic state is read from the game on every call, so one solver can be reused for all decisions of a game and keeps its cache.
+    """
+    def __init__(self, game:Game, time_limit:float = 1.0, max_cache_entries:int = 100000) -> None:
+        """Constructor of boardgame.endgame.EndgameSolver
+
+        Args:
+            game (Game): The game to solve.
+            time_limit (float, optional): Maximum number of seconds per call. Defaults to 1.0.
+            max_cache_entries (int, optional): Maximum number of memoized states, the least recently used states are evicted first. Defaults to 100000.
+        """
+        self.game = game
+        self.time_limit = time_limit
+        self.max_cache_entries = max_cache_entries
+        self.cache:OrderedDict[tuple, float] = OrderedDict()
+        graph = game.graph
+        self.node_ids = list(graph.node_ids)
+        self.positions = graph.positions
+        self.neighbors = [tuple(graph.positions[neighbor_id] for neighbor_id in graph.neighbors(node_id)) for node_id in self.node_ids]
+        self.orange_positions = tuple(sorted(graph.positions[node_id] for node_id in graph.ids_of_type('orange')))
+        self.start_position = graph.positions[game.start_node_id]
+        self.end_position = graph.positions[game.end_node_id]
+        distances = graph.distances_from(game.end_node_id)
+        self.distances_to_end = {graph.positions[node_id]: distance for node_id, distance in distances.items()}
+        self.player_ids = [player.id for player in game.players]
+        self.player_types = [player.type for player in game.players]
+        self.target_freight = game.target_freight
+        self.cascade_damage_threshold = game.cascade_damage_threshold
+        self.cascade_max_level = game.cascade_max_level
+        self.number_of_fund_cards = game.scenario.number_of_fund_cards
+        self.number_of_destruction_cards = game.scenario.number_of_destruction_cards
+        self._deadline = None
+        self._expanded = 0
+
+    def state(self) -> tuple:
+        """Get the compact state of the game as seen by the players.
+
+        Returns:
+            tuple: Hashable state, see the field positions at the top of this module.
+        """
+        game = self.game
+        positions = self.positions
+        active_index = self.player_ids.index(game.active_player_id)
+        segments = []
+        end = len(game.damage_cards)
+        for size in reversed(game.damage_card_segments):
+            segments.append(tuple(sorted(game.damage_cards[end - size:end])))
+            end -= size
+        segments.reverse()
+        fund_cards = game.player_cards.count(1)
+        discards = game.player_cards_discards
+        destruction_draws = tuple(draw for draw, card in enumerate(discards) if card == 0)
+        if (len(discards) + len(game.player_cards) != self.number_of_fund_cards + self.number_of_destruction_cards
+                or math.isnan(destruction_card_probability(self.number_of_fund_cards, self.number_of_destruction_cards, destruction_draws, len(discards)))):
+            # the stack was not dealt and drawn by the rules, its remaining cards are treated as uniformly shuffled
+            destruction_draws = None
+        return (
+            tuple(node.damage for node in game.nodes),
+            tuple(node.freight for node in game.nodes),
+            tuple(positions[player.location_id] for player in game.players),
+            tuple(player.funds for player in game.players),
+            active_index,
+            game.players[active_index].actions_left,
+            game.destruction_level,
+            game.cascade_level,
+            fund_cards,
+            len(game.player_cards) - fund_cards,
+            destruction_draws,
+            tuple(segments),
+            tuple(sorted(game.damage_cards_discards))
+        )
+
+    def win_probability(self) -> float:
+        """Compute the win probability of the current state of the game with optimal play.
+
+        Raises:
+            SolverLimitExceeded: If the time limit is exceeded.
+
+        Returns:
+            float: Win probability.
+        """
+        self._start()
+        return self._value(self.state())
+
+    def best_action(self) -> tuple[float, PlayerAction]:
+        """Compute the best next action of the active player.
+
+        Raises:
+            SolverLimitExceeded: If the time limit is exceeded.
+
+        Returns:
+            tuple[float, PlayerAction]: Win probability with optimal play and the first action that achieves it.
+        """
+        self._start()
+        state = self.state()
+        successors = list(self._successors(state))
+        # prefer winning right away over other actions that win for sure
+        for action, next_state in successors:
+            if next_state is None:
+                return 1.0, self._to_player_action(action, state)
+        best_probability, best_action = -1.0, None
+        for action, next_state in successors:
+            probability = self._value(next_state)
+            if probability > best_probability:
+                best_probability, best_action = probability, action
+            if best_probability >= CERTAIN_WIN:
+                break
+        return best_probability, self._to_player_action(best_action, state)
+
+    def _start(self) -> None:
+        """Internally called to start the time limit of a call.
+        """
+        self._deadline = time.perf_counter() + self.time_limit
+        self._expanded = 0
+
+    def _to_player_action(self, action:tuple, state:tuple) -> PlayerAction:
+        """Internally called to convert a compact action (name, target) to a PlayerAction of the active player.
+        """
+        name, target = action
+        player_id = self.player_ids[state[ACTIVE_PLAYER]]
+        if name in [RUN_ACTION_NAME, FLY_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME]:
+            return PlayerAction(self.game, player_id, ACTIONS[name], parameters={'destination_id': self.node_ids[target]})
+        if name == SHARE_RESOURCES_ACTION_NAME:
+            return PlayerAction(self.game, player_id, ACTIONS[name], parameters={'target_player_id': self.player_ids[target]})
+        return PlayerAction(self.game, player_id, ACTIONS[name])
+
+    def _value(self, state:tuple) -> float:
+        """Internally called to get the memoized win probability of a state.
+        """
+        cache = self.cache
+        value = cache.get(state)
+        if value is not None:
+            cache.move_to_end(state)
+            return value
+        self._expanded += 1
+        if self._expanded % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise SolverLimitExceeded()
+        if not self._can_still_win(state):
+            value = 0.0
+        elif state[ACTIONS_LEFT] > 0:
+            value = 0.0
+            for _, next_state in self._successors(state):
+                value = max(value, 1.0 if next_state is None else self._value(next_state))
+                if value >= CERTAIN_WIN:
+                    break
+        else:
+            value = self._end_of_turn_value(state)
+        cache[state] = value
+        if len(cache) > self.max_cache_entries:
+            cache.popitem(last=False)
+        return value
+
+    def _can_still_win(self, state:tuple) -> bool:
+        """Internally called to prune states in which the industry player cannot transport enough freight units before the player cards run out.
+        """
+        available = available_industry_actions(self.player_types, state[ACTIVE_PLAYER], state[ACTIONS_LEFT], state[FUND_CARDS] + state[DESTRUCTION_CARDS])
+        freight = {position: units for position, units in enumerate(state[FREIGHT]) if units > 0}
+        return minimum_industry_actions(freight, self.distances_to_end, self.start_position, self.end_position, self.target_freight) <= available
+
+    def _successors(self, state:tuple):
+        """Internally called to generate all valid actions of the active player with the resulting states. The resulting state is None if the action wins the game.
+        """
+        damage, freight, locations, funds, active, actions_left = state[DAMAGE], state[FREIGHT], state[LOCATIONS], state[FUNDS], state[ACTIVE_PLAYER], state[ACTIONS_LEFT]
+        player_type = self.player_types[active]
+        location = locations[active]
+
+        def successor(action:tuple, damage=damage, freight=freight, locations=locations, funds=funds, cost:int=1) -> tuple:
+            if freight[self.end_position] >= self.target_freight:
+                return action, None
+            return action, (damage, freight, locations, funds, active, actions_left - cost) + state[DESTRUCTION_LEVEL:]
+
+        def replace(values:tuple, index:int, value:int) -> tuple:
+            return values[:index] + (value,) + values[index + 1:]
+
+        # freight actions first, they lead to wins and allow cutting off the search early
+        if player_type == PLAYER_TYPE_INDUSTRY:
+            if freight[location] > 0 and damage[location] < 3 and (damage[location] != 2 or actions_left >= 2):
+                for neighbor in self.neighbors[location]:
+                    moved = replace(replace(freight, location, freight[location] - 1), neighbor, freight[neighbor] + 1)
+                    yield successor((TRANSPORT_GOODS_ACTION_NAME, neighbor), freight=moved, locations=replace(locations, active, neighbor), cost=2 if damage[location] == 2 else 1)
+            if funds[active] >= 2 and freight[self.start_position] < 3:
+                yield successor((GENERATE_GOODS_ACTION_NAME, None), freight=replace(freight, self.start_position, freight[self.start_position] + 1), funds=replace(funds, active, funds[active] - 2))
+        if player_type == PLAYER_TYPE_DRIVER and funds[active] >= 1 and damage[location] >= 1:
+            # repairing returns a fund instead of costing one, as in player_actions.do_player_action_repair
+            yield successor((REPAIR_ACTION_NAME, None), damage=replace(damage, location, damage[location] - 1), funds=replace(funds, active, funds[active] + 1))
+        if player_type in [PLAYER_TYPE_DRIVER, PLAYER_TYPE_INVESTOR] and funds[active] >= 1:
+            for other, other_location in enumerate(locations):
+                if other != active and other_location == location:
+                    yield successor((SHARE_RESOURCES_ACTION_NAME, other), funds=replace(replace(funds, active, funds[active] - 1), other, funds[other] + 1))
+        for neighbor in self.neighbors[location]:
+            yield successor((RUN_ACTION_NAME, neighbor), locations=replace(locations, active, neighbor))
+        if funds[active] >= 2:
+            for orange_position in self.orange_positions:
+                if orange_position != location:
+                    yield successor((FLY_ACTION_NAME, orange_position), locations=replace(locations, active, orange_position), funds=replace(funds, active, funds[active] - 2))
+        yield successor((DO_NOTHING_ACTION_NAME, None))
+
+    def _end_of_turn_value(self, state:tuple) -> float:
+        """Internally called to get the win probability after the action phase: resupply phase, damage phase and the next turn.
+        """
+        fund_cards, destruction_cards = state[FUND_CARDS], state[DESTRUCTION_CARDS]
+        remaining_cards = fund_cards + destruction_cards
+        if remaining_cards == 0:
+            return 0.0
+        destruction_draws = state[DESTRUCTION_DRAWS]
+        if destruction_draws is None:
+            destruction_probability = destruction_cards / remaining_cards
+        else:
+            drawn_cards = self.number_of_fund_cards + self.number_of_destruction_cards - remaining_cards
+            destruction_probability = destruction_card_probability(self.number_of_fund_cards, self.number_of_destruction_cards, destruction_draws, drawn_cards)
+            destruction_draws += (drawn_cards,)
+        value = 0.0
+        if fund_cards > 0 and destruction_probability < 1:
+            funds = list(state[FUNDS])
+            funds[state[ACTIVE_PLAYER]] += 1
+            after_resupply = list(state)
+            after_resupply[FUNDS] = tuple(funds)
+            after_resupply[ACTIONS_LEFT] = 0
+            after_resupply[FUND_CARDS] -= 1
+            value += (1 - destruction_probability) * self._damage_phase_value(after_resupply)
+        if destruction_cards > 0 and destruction_probability > 0:
+            after_destruction = list(state)
+            after_destruction[DESTRUCTION_LEVEL] += 1
+            after_destruction[DESTRUCTION_CARDS] -= 1
+            after_destruction[DESTRUCTION_DRAWS] = destruction_draws
+            for probability, drawn in self._draw_damage_card(after_destruction, damage_value=3):
+                if drawn is None:
+                    continue
+                # the discards are shuffled and put on top of the damage card stack
+                if len(drawn[DAMAGE_CARD_DISCARDS]) > 0:
+                    drawn[DAMAGE_CARD_SEGMENTS] = drawn[DAMAGE_CARD_SEGMENTS] + (drawn[DAMAGE_CARD_DISCARDS],)
+                    drawn[DAMAGE_CARD_DISCARDS] = ()
+                value += destruction_probability * probability * self._damage_phase_value(drawn)
+        return value
+
+    def _damage_phase_value(self, state:list) -> float:
+        """Internally called to get the win probability of a state (as list) after the resupply phase.
+        """
+        outcomes = [(1.0, state)]
+        for _ in range(DESTRUCTION_LEVEL_TO_DAMAGE_CARD_DRAWS.get(state[DESTRUCTION_LEVEL], 3)):
+            outcomes = [(probability * draw_probability, drawn) for probability, outcome in outcomes for draw_probability, drawn in self._draw_damage_card(outcome, damage_value=1) if drawn is not None]
+        value = 0.0
+        number_of_players = len(self.player_ids)
+        for probability, outcome in outcomes:
+            outcome = list(outcome)
+            outcome[ACTIVE_PLAYER] = (outcome[ACTIVE_PLAYER] + 1) % number_of_players
+            outcome[ACTIONS_LEFT] = 4
+            value += probability * self._value(tuple(outcome))
+        return value
+
+    def _draw_damage_card(self, state:list, damage_value:int) -> list[tuple[float, list]]:
+        """Internally called to enumerate the outcomes of drawing a damage card from the top of the stack. The resulting state is None if the game is lost by a cascade.
+        """
+        segments = state[DAMAGE_CARD_SEGMENTS]
+        if len(segments) == 0:
+            # an empty stack does not damage anything
+            return [(1.0, state)]
+        top = segments[-1]
+        outcomes = []
+        for index, card in enumerate(top):
+            if index > 0 and top[index - 1] == card:
+                continue
+            drawn = list(state)
+            remaining = top[:index] + top[index + 1:]
+            drawn[DAMAGE_CARD_SEGMENTS] = segments[:-1] + ((remaining,) if len(remaining) > 0 else ())
+            drawn[DAMAGE_CARD_DISCARDS] = tuple(sorted(state[DAMAGE_CARD_DISCARDS] + (card,)))
+            if card != 0:
+                damage = list(state[DAMAGE])
+                try:
+                    drawn[CASCADE_LEVEL] = self._add_damage(damage, self.positions[card], damage_value, state[CASCADE_LEVEL], set())
+                    drawn[DAMAGE] = tuple(damage)
+                except _CascadeLost:
+                    drawn = None
+            outcomes.append((top.count(card) / len(top), drawn))
+        return outcomes
+
+    def _add_damage(self, damage:list[int], position:int, damage_value:int, cascade_level:int, affected:set[int]) -> int:
+        """Internally called to add damage to a node and resolve cascades as Game._add_damage_to_node does.
+
+        Returns:
+            int: New cascade level.
+        """
+        damage[position] += damage_value
+        if damage[position] > self.cascade_damage_threshold:
+            damage[position] = self.cascade_damage_threshold
+            affected.add(position)
+            cascade_level += 1
+            if cascade_level > self.cascade_max_level:
+                raise _CascadeLost()
+            for neighbor in self.neighbors[position]:
+                if neighbor not in affected:
+                    cascade_level = self._add_damage(damage, neighbor, 1, cascade_level, affected)
+            affected.discard(position)
+        return cascade_level
+
+
+class EndgameOracle():
+    """Drop-in endgame oracle for agents. When few player cards are left, it chooses the action with the highest win probability.
+    If the solver exceeds its time limit, the oracle gives up for the rest of the game and the agent falls back to its heuristics, so a game never stalls.
+    """
+    def __init__(self, max_player_cards:int = 2, time_limit:float = 0.5, max_cache_entries:int = 100000) -> None:
+        """Constructor of boardgame.endgame.EndgameOracle
+
+        Args:
+            max_player_cards (int, optional): The oracle is used when at most this many player cards are left. Defaults to 2.
+            time_limit (float, optional): Maximum number of seconds per decision. Defaults to 0.5.
+            max_cache_entries (int, optional): Maximum number of memoized states. Defaults to 100000.
+        """
+        self.max_player_cards = max_player_cards
+        self.time_limit = time_limit
+        self.max_cache_entries = max_cache_entries
+        self.solver:EndgameSolver = None
+        self.gave_up = False
+
+    def best_action(self, game:Game) -> PlayerAction:
+        """Get the best next action of the active player, if the game is in the endgame and the solver finishes in time.
+
+        Args:
+            game (Game): The game.
+
+        Returns:
+            PlayerAction: Best action, or None if the heuristics should decide.
+        """
+        if self.solver is None or self.solver.game is not game:
+            self.solver = EndgameSolver(game, time_limit=self.time_limit, max_cache_entries=self.max_cache_entries)
+            self.gave_up = False
+        if self.gave_up or len(game.player_cards) > self.max_player_cards:
+            return None
+        try:
+            return self.solver.best_action()[1]
+        except SolverLimitExceeded:
+            self.gave_up = True
+            return None
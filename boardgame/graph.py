@@ -0,0 +1,162 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.classes import Node
+
+# maximum number of shortest paths that are remembered per graph
+PATH_CACHE_SIZE = 4096
+
+
+class CSRGraph():
+    """Compressed sparse row (CSR) representation of the board adjacency.
+
+    The neighbors of the node at position i are stored in indices[indptr[i]:indptr[i+1]] as node ids, in the same order as in the map file.
+    Node ids are translated to positions with a dictionary lookup, so ids do not need to be contiguous.
+    """
+    def __init__(self, node_ids:list[int], neighbors:list[list[int]], node_types:list[str]=None) -> None:
+        """Constructor of boardgame.graph.CSRGraph
+
+        Args:
+            node_ids (list[int]): Ids of all nodes in board order.
+            neighbors (list[list[int]]): Neighbor ids for each node, same order as node_ids.
+            node_types (list[str], optional): Node type for each node, same order as node_ids. Defaults to None.
+        """
+        self.node_ids = array('l', node_ids)
+        self.positions = {node_id: position for position, node_id in enumerate(node_ids)}
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        for node_neighbors in neighbors:
+            self.indices.extend(node_neighbors)
+            self.indptr.append(len(self.indices))
+        self.node_ids_by_type = {}
+        for node_id, node_type in zip(node_ids, node_types or []):
+            self.node_ids_by_type.setdefault(node_type, []).append(node_id)
+        self.node_ids_by_type = {node_type: frozenset(ids) for node_type, ids in self.node_ids_by_type.items()}
+        # the board never changes, so paths are shared by all games and agents that use this graph
+        self._path_cache:dict[tuple[int, int], tuple[int, ...]] = {}
+
+    @classmethod
+    def from_nodes(cls, nodes:list[Node]) -> CSRGraph:
+        """Build the adjacency from a list of board nodes.
+
+        Args:
+            nodes (list[Node]): Board nodes.
+
+        Returns:
+            CSRGraph: Adjacency of the board.
+        """
+        return cls([node.id for node in nodes], [node.neighbors for node in nodes], [node.node_type for node in nodes])
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id:int) -> bool:
+        return node_id in self.positions
+
+    def __getitem__(self, node_id:int) -> array:
+        """Dictionary style access to the neighbors, so the graph can be used wherever the graph dictionary of parse_nodes_to_graph_format is expected.
+        """
+        return self.neighbors(node_id)
+
+    def neighbors(self, node_id:int) -> array:
+        """Get the neighbor ids of a node.
+
+        Args:
+            node_id (int): node id
+
+        Returns:
+            array: Neighbor ids in map order.
+        """
+        position = self.positions[node_id]
+        return self.indices[self.indptr[position]:self.indptr[position + 1]]
+
+    def ids_of_type(self, node_type:str) -> frozenset:
+        """Get the ids of all nodes of a given type.
+
+        Args:
+            node_type (str): Node type, e.g. "orange" or "purple".
+
+        Returns:
+            frozenset: Node ids of that type.
+        """
+        return self.node_ids_by_type.get(node_type, frozenset())
+
+    def shortest_path(self, start:int, end:int) -> list[int]:
+        """Breadth first search between two nodes. The search stops as soon as the end node is discovered, so its cost depends on the distance and not on the board size.
+        Ties are resolved in the same order as boardgame.agent.find_shortest_path. Results are cached.
+
+        Args:
+            start (int): Id of the start node.
+            end (int): Id of the end node.
+
+        Returns:
+            list[int]: Node ids from start to end (both included), or an empty list if end is not reachable.
+        """
+        return list(self.route(start, end))
+
+    def route(self, start:int, end:int) -> tuple[int, ...]:
+        """Same as shortest_path, but returns the cached path itself instead of a copy.
+
+        Args:
+            start (int): Id of the start node.
+            end (int): Id of the end node.
+
+        Returns:
+            tuple[int, ...]: Node ids from start to end (both included), or an empty tuple if end is not reachable.
+        """
+        path = self._path_cache.get((start, end))
+        if path is None:
+            if len(self._path_cache) >= PATH_CACHE_SIZE:
+                self._path_cache.clear()
+            path = self._path_cache[(start, end)] = tuple(self._search_shortest_path(start, end))
+        return path
+
+    def _search_shortest_path(self, start:int, end:int) -> list[int]:
+        """Internally called by shortest_path to run the breadth first search without the cache.
+        """
+        if start == end:
+            return [start]
+        indptr, indices = self.indptr, self.indices
+        positions = self.positions
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            at = queue.popleft()
+            position = positions[at]
+            for next_id in indices[indptr[position]:indptr[position + 1]]:
+                if next_id in parents:
+                    continue
+                parents[next_id] = at
+                if next_id == end:
+                    path = [end]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    path.reverse()
+                    return path
+                queue.append(next_id)
+        return []
+
+    def distances_from(self, start:int) -> dict[int, int]:
+        """Hop distances from a node to all reachable nodes.
+
+        Args:
+            start (int): Id of the start node.
+
+        Returns:
+            dict[int, int]: Distance for each reachable node id.
+        """
+        indptr, indices = self.indptr, self.indices
+        positions = self.positions
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            at = queue.popleft()
+            position = positions[at]
+            for next_id in indices[indptr[position]:indptr[position + 1]]:
+                if next_id not in distances:
+                    distances[next_id] = distances[at] + 1
+                    queue.append(next_id)
+        return distances
@@ -0,0 +1,131 @@
+"""Generator for synthetic canal network maps in the format of res/map.json.
+
+Generated maps follow the conventions of the original map: ids start at 1, canal nodes come first and the ports (purple nodes) are appended at the end,
+so that the damage deck can be built from all non-port node ids.
+"""
+from __future__ import annotations
+import json
+import random
+from collections import deque
+
+NODE_TYPE_CANAL = "green"
+NODE_TYPE_HUB = "orange"
+NODE_TYPE_PORT = "purple"
+
+
+def generate_map(number_of_nodes:int, random_seed:int = None, number_of_ports:int = 3, branch_probability:float = 0.15, loop_probability:float = 0.02) -> tuple[list[dict], int, int]:
+    """Generate a connected canal network.
+
+    The canals are grown as long chains that occasionally branch off an earlier node and rarely reconnect to a nearby node, which mimics real waterways.
+    Nodes with three or more canal connections become hubs (orange), all other canal nodes are green. Ports (purple) are attached to one or two adjacent canal nodes.
+
+    Args:
+        number_of_nodes (int): Total number of nodes including the ports.
+        random_seed (int, optional): Seed for the generator. Defaults to None.
+        number_of_ports (int, optional): Number of port nodes. Defaults to 3.
+        branch_probability (float, optional): Probability that a new canal node branches off a random earlier node instead of extending the current chain. Defaults to 0.15.
+        loop_probability (float, optional): Probability that a new canal node is additionally connected to a nearby earlier node. Defaults to 0.02.
+
+    Raises:
+        ValueError: If the map would have less than two ports or less than two canal nodes.
+
+    Returns:
+        tuple[list[dict], int, int]: Map entries as in res/map.json, the id of the start port and the id of the end port (the port farthest away from the start port).
+    """
+    if number_of_ports < 2:
+        raise ValueError("A map needs at least two ports.")
+    number_of_canal_nodes = number_of_nodes - number_of_ports
+    if number_of_canal_nodes < 2:
+        raise ValueError("A map needs at least two canal nodes.")
+    rng = random.Random(random_seed)
+
+    neighbors = {node_id: [] for node_id in range(1, number_of_nodes + 1)}
+    def connect(a:int, b:int) -> None:
+        if a != b and b not in neighbors[a]:
+            neighbors[a].append(b)
+            neighbors[b].append(a)
+
+    for node_id in range(2, number_of_canal_nodes + 1):
+        if rng.random() < branch_probability:
+            connect(node_id, rng.randint(1, node_id - 1))
+        else:
+            connect(node_id, node_id - 1)
+        if node_id > 3 and rng.random() < loop_probability:
+            connect(node_id, rng.randint(max(1, node_id - 10), node_id - 2))
+
+    canal_degrees = {node_id: len(neighbors[node_id]) for node_id in range(1, number_of_canal_nodes + 1)}
+    for port_id in range(number_of_canal_nodes + 1, number_of_nodes + 1):
+        anchor_id = rng.randint(1, number_of_canal_nodes)
+        connect(port_id, anchor_id)
+        # ports often lie between two locks of the same canal
+        if rng.random() < 0.5 and len(neighbors[anchor_id]) > 1:
+            connect(port_id, neighbors[anchor_id][0])
+
+    entries = []
+    for node_id in range(1, number_of_nodes + 1):
+        if node_id > number_of_canal_nodes:
+            node_type = NODE_TYPE_PORT
+        elif canal_degrees[node_id] >= 3:
+            node_type = NODE_TYPE_HUB
+        else:
+            node_type = NODE_TYPE_CANAL
+        entries.append({"id": node_id, "name": f"{node_type.capitalize()} {node_id}", "node_type": node_type, "neighbors": sorted(neighbors[node_id])})
+
+    start_node_id = number_of_canal_nodes + 1
+    distances = _distances(entries, start_node_id)
+    end_node_id = max(range(start_node_id + 1, number_of_nodes + 1), key=lambda port_id: distances[port_id])
+    validate_map(entries)
+    return entries, start_node_id, end_node_id
+
+
+def validate_map(entries:list[dict]) -> None:
+    """Check that a list of map entries describes a valid board.
+
+    Args:
+        entries (list[dict]): Map entries as in res/map.json.
+
+    Raises:
+        ValueError: If ids are not unique, neighbors are unknown or not symmetric, node types are unknown, there are less than two ports, or the board is not connected.
+    """
+    node_ids = [entry["id"] for entry in entries]
+    if len(set(node_ids)) != len(node_ids):
+        raise ValueError("Node ids must be unique.")
+    neighbors = {entry["id"]: set(entry["neighbors"]) for entry in entries}
+    for entry in entries:
+        if entry["node_type"] not in [NODE_TYPE_CANAL, NODE_TYPE_HUB, NODE_TYPE_PORT]:
+            raise ValueError(f"Node {entry['id']} has unknown node type {entry['node_type']}.")
+        for neighbor_id in entry["neighbors"]:
+            if neighbor_id not in neighbors:
+                raise ValueError(f"Node {entry['id']} references unknown neighbor {neighbor_id}.")
+            if entry["id"] not in neighbors[neighbor_id]:
+                raise ValueError(f"Connection between node {entry['id']} and {neighbor_id} is not symmetric.")
+    if len([entry for entry in entries if entry["node_type"] == NODE_TYPE_PORT]) < 2:
+        raise ValueError("A map needs at least two ports.")
+    if len(_distances(entries, node_ids[0])) != len(node_ids):
+        raise ValueError("The map is not connected.")
+
+
+def write_map(entries:list[dict], path_to_json:str) -> None:
+    """Write map entries to a json file that can be passed to Game(path_to_map=...).
+
+    Args:
+        entries (list[dict]): Map entries as in res/map.json.
+        path_to_json (str): Output path.
+    """
+    with open(path_to_json, "w") as f:
+        json.dump(entries, f)
+
+
+def _distances(entries:list[dict], start:int) -> dict[int, int]:
+    """Hop distances from a node to all reachable nodes of a list of map entries.
+    """
+    neighbors = {entry["id"]: entry["neighbors"] for entry in entries}
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        at = queue.popleft()
+        for next_id in neighbors[at]:
+            if next_id not in distances:
+                distances[next_id] = distances[at] + 1
+                queue.append(next_id)
+    return distances
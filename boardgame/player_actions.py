@@ -1,16 +1,9 @@
 from __future__ import annotations
 from boardgame.config import ALLOWED_ACTIONS, COORDINATE_DRIVERS_ACTION_NAME, DO_NOTHING_ACTION_NAME, FLY_ACTION_NAME, GENERATE_GOODS_ACTION_NAME, PLAYER_TYPE_DRIVER, PLAYER_TYPE_INDUSTRY, PLAYER_TYPE_INVESTOR, REPAIR_ACTION_NAME, RUN_ACTION_NAME, SHARE_RESOURCES_ACTION_NAME, SPECIAL_FLY_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME
+from types import MappingProxyType
 from typing import Any, Callable, TYPE_CHECKING
 if TYPE_CHECKING:
     from boardgame.classes import Game, Player
-import logging
-
-# logging configuration 
-try:
-    logging.basicConfig(filename='game.log', encoding='utf-8', level=logging.DEBUG, filemode='w')
-except ValueError:
-    # produces a value error that does not seem to have any effect, so ignoring it. Possible a bug in python version 3.7.x
-    pass
 
 def do_player_action_nothing(game:Game, player_id:int) -> None:
     """Spend an action point without doing anything (skip). 
@@ -274,7 +267,8 @@ def get_valid_player_actions(game:Game, player_id:int) -> list[PlayerAction]:
 
     return valid_actions
 
-ACTIONS ={
+# read-only, the dispatch table is shared by all games
+ACTIONS = MappingProxyType({
     RUN_ACTION_NAME: do_player_action_run,
     FLY_ACTION_NAME: do_player_action_fly,
     SPECIAL_FLY_ACTION_NAME: do_player_action_special_flight,
@@ -284,7 +278,88 @@ ACTIONS ={
     REPAIR_ACTION_NAME: do_player_action_repair,
     SHARE_RESOURCES_ACTION_NAME: do_player_action_share_resources, 
     DO_NOTHING_ACTION_NAME: do_player_action_nothing
-}
+})
+
+# compact actions are tuples (action code, argument), where the code is the position of the action in ACTIONS and the argument is None, a node or player id,
+# or a tuple of arguments. Games provide them interned (see Game.compact_action), so agents that return compact actions do not allocate objects in steady state.
+ACTION_CODES = MappingProxyType({action_name: code for code, action_name in enumerate(ACTIONS)})
+_ACTION_FUNCTIONS = tuple(ACTIONS.values())
+# actions whose argument is a destination node id, and actions without argument
+_NODE_ARGUMENT_ACTIONS = (RUN_ACTION_NAME, FLY_ACTION_NAME, SPECIAL_FLY_ACTION_NAME, TRANSPORT_GOODS_ACTION_NAME)
+_NO_ARGUMENT_ACTIONS = (GENERATE_GOODS_ACTION_NAME, REPAIR_ACTION_NAME, DO_NOTHING_ACTION_NAME)
+
+def compact_action(action_name:str, argument:Any = None) -> tuple:
+    """Create the compact representation of a player action. Use Game.compact_action to get the interned tuple instead of a new one.
+
+    Args:
+        action_name (str): Name of the action, e.g. RUN_ACTION_NAME.
+        argument (Any, optional): Destination node id, target player id, or a tuple of both for COORDINATE_DRIVERS_ACTION_NAME. Defaults to None.
+
+    Returns:
+        tuple: Tuple (action code, argument).
+    """
+    return (ACTION_CODES[action_name], argument)
+
+def intern_compact_actions(node_ids:list[int]) -> MappingProxyType:
+    """Create the compact actions of a map in advance: all actions without argument and all actions with a destination node. The table is read-only, so it can
+    be shared by all games on the map, also across threads.
+
+    Args:
+        node_ids (list[int]): Ids of the nodes of the map.
+
+    Returns:
+        MappingProxyType: Compact action per argument (None for actions without argument) per action name.
+    """
+    table = {action_name: MappingProxyType({}) for action_name in ACTIONS}
+    for action_name in _NO_ARGUMENT_ACTIONS:
+        table[action_name] = MappingProxyType({None: compact_action(action_name)})
+    for action_name in _NODE_ARGUMENT_ACTIONS:
+        table[action_name] = MappingProxyType({node_id: compact_action(action_name, node_id) for node_id in node_ids})
+    return MappingProxyType(table)
+
+def run_action(game:Game, player_id:int, action:PlayerAction|tuple) -> None:
+    """Run a player action of the active player, given either as PlayerAction or as compact action.
+
+    Args:
+        game (Game): Reference to the game object.
+        player_id (int): Id of the active player, the player of compact actions.
+        action (PlayerAction | tuple): The action.
+
+    Raises:
+        InvalidActionException: If the action is not feasible with the given parameters.
+    """
+    if type(action) is not tuple:
+        action.run()
+        return
+    code, argument = action
+    function = _ACTION_FUNCTIONS[code]
+    if argument is None:
+        function(game, player_id)
+    elif type(argument) is tuple:
+        function(game, player_id, *argument)
+    else:
+        function(game, player_id, argument)
+    if game.log_enabled:
+        _log_action(game, player_id, function, argument)
+
+def get_action_name(action:PlayerAction|tuple) -> str:
+    """Get the name of the function of a player action.
+
+    Args:
+        action (PlayerAction | tuple): PlayerAction or compact action.
+
+    Returns:
+        str: Function name, e.g. "do_player_action_run".
+    """
+    return _ACTION_FUNCTIONS[action[0]].__name__ if type(action) is tuple else action.action.__name__
+
+def _log_action(game:Game, player_id:int, function:Callable, parameters:Any) -> None:
+    """Internally called to log a player action after it was run.
+    """
+    player = game._get_player_by_id(player_id)
+    game.logger.info(f"{player.name} {function.__name__} (parameters: {parameters})")
+    game.logger.info(f"Player Status: {player.__dict__}" )
+    game.logger.info(f"Node Status: {game._get_node_by_id(player.location_id).__dict__}")
 
 class PlayerAction():
     """Represents a player action. 
@@ -307,10 +382,9 @@ class PlayerAction():
         """Executes the player action with the given parameters and logs to log file. 
         """
         self.action(self.game, self.player_id, **self.parameters) if self.parameters else self.action(self.game, self.player_id)
-        player = self.game._get_player_by_id(self.player_id)
-        logging.info(f"{player.name} {self.action.__name__} (parameters: {self.parameters})")
-        logging.info(f"Player Status: {player.__dict__}" )
-        logging.info(f"Node Status: {self.game._get_node_by_id(player.location_id).__dict__}")
+        # the status dumps are only formatted if they are logged
+        if self.game.log_enabled:
+            _log_action(self.game, self.player_id, self.action, self.parameters)
 
 class InvalidActionException(Exception):
     def __init__(self, player:Player, message:str=""):
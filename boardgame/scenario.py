@@ -0,0 +1,136 @@
+"""Validated, immutable game parameters.
+
+A Scenario checks its parameters once. Games created from the same scenario are stamped out of a prebuilt template (nodes, unshuffled damage cards and
+the adjacency of the map), so only the shuffling and the opening damage are done per game.
+
+    scenario = Scenario(cascade_max_level=10, number_of_fund_cards=40)
+    for random_seed in range(1, 1001):
+        g = scenario.new_game(random_seed, disable_logging=True)
+        g.set_agent(Agent(g))
+        g.play_game()
+"""
+from __future__ import annotations
+from boardgame.config import CASCADE_DAMAGE_THRESHOLD, CASCADE_MAX_LEVEL, NUMBER_OF_DAMAGE_CARD_JOKERS, NUMBER_OF_DESTRUCTION_CARDS, NUMBER_OF_FUND_CARDS, TARGET_AMOUNT, TARGET_END_NODE, TARGET_START_NODE
+from typing import TYPE_CHECKING
+import os
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.classes import Game
+
+DEFAULT_MAP_PATH = os.path.join(os.path.dirname(__file__), "res", "map.json")
+
+# parameters that have to be at least this value
+_MINIMUM_VALUES = {
+    'target_amount': 1,
+    'number_of_damage_card_jokers': 0,
+    'number_of_fund_cards': 0,
+    # the destruction cards divide the fund cards into parts
+    'number_of_destruction_cards': 1,
+    'cascade_damage_threshold': 1,
+    'cascade_max_level': 1,
+}
+
+
+class Scenario():
+    """Game parameters, see config.py for the defaults. Scenarios are immutable and hashable, two scenarios with the same parameters are equal.
+    Written without dataclasses, which would add the import of inspect to every game.
+
+    Raises:
+        ValueError: If a parameter has the wrong type or value, or a target node is not on the map.
+        FileNotFoundError: If the map file does not exist.
+    """
+    __slots__ = ('target_start_node', 'target_end_node', 'target_amount', 'number_of_damage_card_jokers', 'number_of_fund_cards', 'number_of_destruction_cards',
+                 'cascade_damage_threshold', 'cascade_max_level', 'path_to_map')
+
+    def __init__(self, target_start_node:int = TARGET_START_NODE, target_end_node:int = TARGET_END_NODE, target_amount:int = TARGET_AMOUNT,
+                 number_of_damage_card_jokers:int = NUMBER_OF_DAMAGE_CARD_JOKERS, number_of_fund_cards:int = NUMBER_OF_FUND_CARDS,
+                 number_of_destruction_cards:int = NUMBER_OF_DESTRUCTION_CARDS, cascade_damage_threshold:int = CASCADE_DAMAGE_THRESHOLD,
+                 cascade_max_level:int = CASCADE_MAX_LEVEL, path_to_map:str = DEFAULT_MAP_PATH) -> None:
+        """Constructor of boardgame.scenario.Scenario
+
+        Args:
+            target_start_node (int, optional): Id of the node where freight units are generated. Defaults to TARGET_START_NODE.
+            target_end_node (int, optional): Id of the node the freight units have to be transported to. Defaults to TARGET_END_NODE.
+            target_amount (int, optional): Number of freight units needed to win. Defaults to TARGET_AMOUNT.
+            number_of_damage_card_jokers (int, optional): Number of joker cards in the damage card stack. Defaults to NUMBER_OF_DAMAGE_CARD_JOKERS.
+            number_of_fund_cards (int, optional): Number of fund cards in the player card stack. Defaults to NUMBER_OF_FUND_CARDS.
+            number_of_destruction_cards (int, optional): Number of destruction cards in the player card stack. Defaults to NUMBER_OF_DESTRUCTION_CARDS.
+            cascade_damage_threshold (int, optional): Maximum damage of a node, further damage starts a cascade. Defaults to CASCADE_DAMAGE_THRESHOLD.
+            cascade_max_level (int, optional): Cascade level at which the game is lost. Defaults to CASCADE_MAX_LEVEL.
+            path_to_map (str, optional): Map file, e.g. written by boardgame.map_generator. Defaults to DEFAULT_MAP_PATH.
+        """
+        values = locals()
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+        for name, minimum in _MINIMUM_VALUES.items():
+            value = getattr(self, name)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"{name} must be an integer, got {value!r}.")
+            if value < minimum:
+                raise ValueError(f"{name} must be at least {minimum}, got {value}.")
+        # the same map file always gives the same key of the map cache and the template cache
+        object.__setattr__(self, 'path_to_map', os.path.abspath(self.path_to_map))
+        from boardgame.classes import _load_map
+        graph = _load_map(self.path_to_map)[1]
+        for name in ('target_start_node', 'target_end_node'):
+            if getattr(self, name) not in graph:
+                raise ValueError(f"{name} {getattr(self, name)!r} is not a node of {self.path_to_map}.")
+        if self.target_start_node == self.target_end_node:
+            raise ValueError("target_start_node and target_end_node must be different nodes.")
+
+    def __setattr__(self, name:str, value) -> None:
+        raise AttributeError(f"Scenario is immutable, cannot assign to {name}.")
+
+    def __delattr__(self, name:str) -> None:
+        raise AttributeError(f"Scenario is immutable, cannot delete {name}.")
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return f"Scenario({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def __reduce__(self) -> tuple:
+        # the immutable attributes cannot be restored one by one, so unpickling calls the constructor
+        return (self.__class__, self._values())
+
+    def _values(self) -> tuple:
+        """Internally called to get the parameters in the order of the constructor.
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_game_kwargs(cls, **kwargs) -> Scenario:
+        """Create a scenario from the keyword arguments of Game. Parameters that are None fall back to the defaults, all other values are validated, e.g. 0 fund cards are allowed, but a target amount of 0 is not.
+
+        Args:
+            **kwargs: Game parameters, see the fields of Scenario.
+
+        Raises:
+            ValueError: If an unknown parameter is given or a parameter is invalid.
+
+        Returns:
+            Scenario: The validated scenario.
+        """
+        unknown_parameters = set(kwargs) - set(cls.__slots__)
+        if unknown_parameters:
+            raise ValueError(f"Unknown game parameters: {sorted(unknown_parameters)}")
+        return cls(**{name: value for name, value in kwargs.items() if value is not None})
+
+    def new_game(self, random_seed:int = None, disable_logging:bool = False) -> Game:
+        """Create a game of this scenario.
+
+        Args:
+            random_seed (int, optional): Custom seed for all random operation. Defaults to None.
+            disable_logging (bool, optional): Set to true to disable logging. Defaults to False.
+
+        Returns:
+            Game: New game, equal to Game(random_seed, disable_logging, **kwargs) with the parameters of this scenario.
+        """
+        from boardgame.classes import Game
+        return Game(random_seed, disable_logging, scenario=self)
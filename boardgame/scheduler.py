@@ -0,0 +1,125 @@
+"""Batched execution of many games that run as generators (see Game.play_game_steps).
+
+The BatchScheduler advances every game until it waits for a decision, hands all pending decision requests to a policy in one call and resumes each game with its answer.
+Policies that are cheaper per decision when evaluated in batches, e.g. neural networks or search, amortize their overhead over all games.
+The games are independent, so the results per seed are identical to playing the games one after the other.
+
+    def policy(requests):
+        return [request.game.agent.get_next_action_for_player(request.player_id) for request in requests]
+
+    scheduler = BatchScheduler(policy)
+    for random_seed in range(1, 1001):
+        g = Game(random_seed=random_seed, disable_logging=True)
+        g.set_agent(Agent(g))
+        scheduler.add_game(g)
+    results = scheduler.run()
+"""
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.classes import DecisionRequest, Game
+    from boardgame.player_actions import PlayerAction
+
+
+def decide_with_game_agents(requests:list[DecisionRequest]) -> list[PlayerAction]:
+    """Default policy of the BatchScheduler: answer every request with the agent set in its game.
+
+    Args:
+        requests (list[DecisionRequest]): Pending decision requests.
+
+    Returns:
+        list[PlayerAction]: One player action per request, in the same order.
+    """
+    return [request.game.agent.get_next_action_for_player(request.player_id) for request in requests]
+
+
+class BatchScheduler():
+    """Drives many games as generators and gathers their decision requests into batches.
+    """
+    def __init__(self, policy:Callable[[list[DecisionRequest]], list[PlayerAction]] = decide_with_game_agents, max_batch_size:int = None) -> None:
+        """Constructor of boardgame.scheduler.BatchScheduler
+
+        Args:
+            policy (Callable[[list[DecisionRequest]], list[PlayerAction]], optional): Called with a batch of pending requests, returns one player action per request in the same order. Defaults to decide_with_game_agents.
+            max_batch_size (int, optional): Maximum number of requests per policy call. Defaults to None, i.e. all pending requests.
+        """
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.games:list[Game] = []
+        self.batches = 0
+        self.decisions = 0
+
+    def add_game(self, game:Game) -> int:
+        """Add a game that has not been started yet.
+
+        Args:
+            game (Game): The game.
+
+        Returns:
+            int: Index of the game's result in the list returned by run.
+        """
+        self.games.append(game)
+        return len(self.games) - 1
+
+    def run(self) -> list[dict]:
+        """Play all added games to the end.
+
+        Raises:
+            ValueError: If the policy does not return one action per request.
+
+        Returns:
+            list[dict]: Result dictionaries of Game.play_game in the order the games were added.
+        """
+        results = [None] * len(self.games)
+        # index of the game -> (generator, pending request)
+        pending = {}
+        for index, game in enumerate(self.games):
+            # passive turns can only be skipped if the games' own agents decide
+            self._advance(index, game.play_game_steps(fast_forward_passive_turns=self.policy is decide_with_game_agents), None, pending, results)
+        while pending:
+            indices = list(pending)[:self.max_batch_size]
+            requests = [pending[index][1] for index in indices]
+            actions = self.policy(requests)
+            if len(actions) != len(requests):
+                raise ValueError(f"The policy returned {len(actions)} actions for {len(requests)} requests.")
+            self.batches += 1
+            self.decisions += len(requests)
+            for index, action in zip(indices, actions):
+                self._advance(index, pending.pop(index)[0], action, pending, results)
+        self.games = []
+        return results
+
+    def _advance(self, index:int, steps, action:PlayerAction, pending:dict, results:list[dict]) -> None:
+        """Internally called to resume a game with an action (or start it with None) until it requests the next decision or ends.
+        """
+        try:
+            pending[index] = (steps, steps.send(action))
+        except StopIteration as e:
+            results[index] = e.value
+
+
+def play_games_batched(random_seeds:list[int], game_kwargs:dict = None, agent_kwargs:dict = None, policy:Callable[[list[DecisionRequest]], list[PlayerAction]] = decide_with_game_agents, max_batch_size:int = None) -> list[dict]:
+    """Play one game per random seed with the same parameters on a BatchScheduler, see boardgame.sweep.play_games.
+
+    Args:
+        random_seeds (list[int]): Random seeds of the games.
+        game_kwargs (dict, optional): Game parameters, see Game. Defaults to None.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+        policy (Callable[[list[DecisionRequest]], list[PlayerAction]], optional): Batch policy of the scheduler. Defaults to decide_with_game_agents.
+        max_batch_size (int, optional): Maximum number of requests per policy call. Defaults to None.
+
+    Returns:
+        list[dict]: Result dictionaries with the additional field "random_seed" in the order of the seeds.
+    """
+    from boardgame.agent import Agent
+    from boardgame.classes import Game
+    scheduler = BatchScheduler(policy, max_batch_size)
+    for random_seed in random_seeds:
+        g = Game(random_seed=random_seed, disable_logging=True, **(game_kwargs or {}))
+        g.set_agent(Agent(g, **(agent_kwargs or {})))
+        scheduler.add_game(g)
+    results = scheduler.run()
+    for random_seed, result in zip(random_seeds, results):
+        result["random_seed"] = random_seed
+    return results
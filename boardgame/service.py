@@ -0,0 +1,199 @@
+"""Asyncio service that runs sweeps in the background and streams the results while they are computed.
+
+Notebooks keep running while a sweep is played, get the results of finished games early and can cancel a sweep. Identical sweeps that are submitted while
+one of them is still running are played only once and share the job.
+
+    service = SweepService()
+    job = service.submit({"cascade_max_level": [8, 10]}, range(1, 1001))
+    async for event in job.stream():
+        print(event["summary"])
+    job.cancel()
+"""
+from __future__ import annotations
+from boardgame.sweep import parameter_points, play_games
+from concurrent.futures import Executor, ProcessPoolExecutor
+import asyncio
+import json
+
+
+class SweepJob():
+    """A sweep that is played by a SweepService. Results are collected in the order the chunks finish.
+    """
+    def __init__(self, parameter_grid:dict[str, list], random_seeds:list[int], agent_kwargs:dict) -> None:
+        """Constructor of boardgame.service.SweepJob
+
+        Args:
+            parameter_grid (dict[str, list]): Values per game parameter, see Game.
+            random_seeds (list[int]): Random seeds played for every combination.
+            agent_kwargs (dict): Agent heuristic parameters, see AGENT_PARAMETERS in config.py.
+        """
+        self.parameter_grid = parameter_grid
+        self.random_seeds = random_seeds
+        self.agent_kwargs = agent_kwargs
+        self.total_games = len(parameter_points(parameter_grid)) * len(random_seeds)
+        self.results:list[dict] = []
+        # running aggregate per parameter point
+        self._summaries:dict[str, dict] = {}
+        self._summary_of_result:list[dict] = []
+        self._changed = asyncio.Condition()
+        self._task:asyncio.Task = None
+
+    def done(self) -> bool:
+        """Check if the job is finished, failed or cancelled.
+
+        Returns:
+            bool: True if no more results will arrive.
+        """
+        return self._task is not None and self._task.done()
+
+    def cancelled(self) -> bool:
+        """Check if the job was cancelled.
+
+        Returns:
+            bool: True if the job was cancelled.
+        """
+        return self._task is not None and self._task.cancelled()
+
+    def cancel(self) -> None:
+        """Cancel the job. Chunks that are already running in the worker pool are finished, but their results are discarded. Cancels the job for every client that shares it.
+        """
+        if self._task is not None:
+            self._task.cancel()
+
+    def summaries(self) -> list[dict]:
+        """Get the running aggregates of all parameter points.
+
+        Returns:
+            list[dict]: One dictionary per parameter point with the parameters and the fields "games", "wins", "win_rate" and "mean_turn".
+        """
+        return [dict(summary) for summary in self._summaries.values()]
+
+    async def stream(self):
+        """Iterate over the results as they arrive, starting with the first result of the job.
+
+        Raises:
+            asyncio.CancelledError: If the job is cancelled.
+
+        Yields:
+            dict: Event with the fields "result" (result dictionary as in boardgame.sweep.run_sweep) and "summary" (running aggregate of the result's parameter point after this result).
+        """
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > index or self.done())
+            while index < len(self.results):
+                yield {"result": self.results[index], "summary": self._summary_of_result[index]}
+                index += 1
+            if self.done() and index == len(self.results):
+                break
+        # raises if the job was cancelled or failed
+        self._task.result()
+
+    async def wait(self) -> list[dict]:
+        """Wait until all games are played.
+
+        Raises:
+            asyncio.CancelledError: If the job is cancelled.
+
+        Returns:
+            list[dict]: Result dictionaries in the order the chunks finished.
+        """
+        return [event["result"] async for event in self.stream()]
+
+    async def _run(self, executor:Executor, chunk_size:int) -> None:
+        """Internally called to submit all chunks to the executor and collect their results.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def play_chunk(game_kwargs:dict, random_seeds:list[int]) -> tuple[dict, list[dict]]:
+            return game_kwargs, await loop.run_in_executor(executor, play_games, random_seeds, game_kwargs, self.agent_kwargs)
+
+        chunks = [self.random_seeds[i:i + chunk_size] for i in range(0, len(self.random_seeds), chunk_size)]
+        tasks = [asyncio.ensure_future(play_chunk(game_kwargs, chunk)) for game_kwargs in parameter_points(self.parameter_grid) for chunk in chunks]
+        try:
+            for task in asyncio.as_completed(tasks):
+                game_kwargs, results = await task
+                summary = self._summaries.setdefault(json.dumps(game_kwargs, sort_keys=True), {**game_kwargs, "games": 0, "wins": 0, "win_rate": 0.0, "mean_turn": 0.0})
+                for result in results:
+                    result.update(game_kwargs)
+                    summary["games"] += 1
+                    summary["wins"] += result["result"] == "WON"
+                    summary["win_rate"] = summary["wins"] / summary["games"]
+                    summary["mean_turn"] += (result["turn"] - summary["mean_turn"]) / summary["games"]
+                    self.results.append(result)
+                    self._summary_of_result.append(dict(summary))
+                async with self._changed:
+                    self._changed.notify_all()
+        finally:
+            # chunks that have not started yet are removed from the executor queue
+            for task in tasks:
+                task.cancel()
+
+    def _notify_when_done(self, task:asyncio.Task) -> None:
+        """Internally called when the job task ends to wake up all streams.
+        """
+        async def notify() -> None:
+            async with self._changed:
+                self._changed.notify_all()
+        asyncio.ensure_future(notify())
+
+
+class SweepService():
+    """Accepts sweeps and plays them on a worker pool in the background of the running event loop.
+    """
+    def __init__(self, executor:Executor = None, max_workers:int = None, chunk_size:int = 10) -> None:
+        """Constructor of boardgame.service.SweepService
+
+        Args:
+            executor (Executor, optional): Executor the chunks of games are submitted to, e.g. a ThreadPoolExecutor. Defaults to a ProcessPoolExecutor with boardgame.workers.init_worker as initializer.
+            max_workers (int, optional): Number of processes of the default executor. Defaults to None.
+            chunk_size (int, optional): Number of seeds per submitted chunk, i.e. the granularity of the streamed results. Defaults to 10.
+        """
+        self._own_executor = executor is None
+        if self._own_executor:
+            from boardgame.workers import init_worker
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker)
+        self.executor = executor
+        self.chunk_size = chunk_size
+        # jobs that are running, by their specification
+        self.jobs:dict[str, SweepJob] = {}
+
+    def submit(self, parameter_grid:dict[str, list], random_seeds:list[int], agent_kwargs:dict = None) -> SweepJob:
+        """Start a sweep, or join the running job with the same specification. Must be called while an event loop is running, e.g. in a notebook cell.
+
+        Args:
+            parameter_grid (dict[str, list]): Values per game parameter, see Game.
+            random_seeds (list[int]): Random seeds played for every combination.
+            agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+
+        Returns:
+            SweepJob: The job playing the sweep.
+        """
+        random_seeds = list(random_seeds)
+        agent_kwargs = agent_kwargs or {}
+        key = json.dumps({"parameter_grid": parameter_grid, "random_seeds": random_seeds, "agent_kwargs": agent_kwargs}, sort_keys=True)
+        job = self.jobs.get(key)
+        if job is not None and not job.done():
+            return job
+        job = SweepJob(parameter_grid, random_seeds, agent_kwargs)
+        job._task = asyncio.ensure_future(job._run(self.executor, self.chunk_size))
+        job._task.add_done_callback(job._notify_when_done)
+        job._task.add_done_callback(lambda task: self.jobs.pop(key, None) if self.jobs.get(key) is job else None)
+        self.jobs[key] = job
+        return job
+
+    async def shutdown(self) -> None:
+        """Cancel all running jobs and shut down the default executor.
+        """
+        jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*[job._task for job in jobs], return_exceptions=True)
+        if self._own_executor:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def __aenter__(self) -> SweepService:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.shutdown()
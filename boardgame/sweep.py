@@ -0,0 +1,216 @@
+"""Helpers to play many games with the same parameters, e.g. for simulation sweeps or the evaluation of agent parameters.
+
+All functions are defined at module level so they can be submitted to process pools. Games do not share mutable state, so they can also run
+on threads, which avoids pickling and worker startup and runs in parallel on free-threaded Python builds:
+
+    from boardgame.sweep import run_sweep
+    results = run_sweep({"cascade_max_level": [8, 10], "number_of_fund_cards": [40, 56]}, range(1, 101))
+
+If only aggregates are needed, run_sweep_summaries keeps one mergeable GameSummary per parameter point instead of the result of every game:
+
+    summaries = run_sweep_summaries({"cascade_max_level": [8, 10]}, range(1, 100001), callback=print)
+"""
+from __future__ import annotations
+from boardgame.aggregates import GameSummary
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, TYPE_CHECKING
+import itertools
+import os
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.scenario import Scenario
+    from boardgame.telemetry import TelemetryRecorder
+
+
+def play_game_with_parameters(random_seed:int, game_kwargs:dict = None, agent_kwargs:dict = None) -> dict:
+    """Play a single game without logging.
+
+    Args:
+        random_seed (int): Random seed of the game.
+        game_kwargs (dict, optional): Game parameters, see Game. Defaults to None.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+
+    Returns:
+        dict: Result dictionary of Game.play_game with the additional field "random_seed".
+    """
+    from boardgame.scenario import Scenario
+    return _play_scenario(random_seed, Scenario.from_game_kwargs(**(game_kwargs or {})), agent_kwargs)
+
+
+def _play_scenario(random_seed:int, scenario:Scenario, agent_kwargs:dict = None, terminate_early:bool = False, telemetry:TelemetryRecorder = None) -> dict:
+    """Internally called to play a single game of a validated scenario without logging.
+    """
+    from boardgame.agent import Agent
+    g = scenario.new_game(random_seed, disable_logging=True)
+    g.set_agent(Agent(g, compact_actions=True, **(agent_kwargs or {})))
+    if telemetry is not None:
+        g.set_telemetry(telemetry)
+    result = g.play_game(terminate_early=terminate_early)
+    result["random_seed"] = random_seed
+    return result
+
+
+def play_games(random_seeds:list[int], game_kwargs:dict = None, agent_kwargs:dict = None, terminate_early:bool = False, telemetry:bool = False) -> list[dict]:
+    """Play one game per random seed with the same parameters.
+
+    Args:
+        random_seeds (list[int]): Random seeds of the games.
+        game_kwargs (dict, optional): Game parameters, see Game. Defaults to None.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+        terminate_early (bool, optional): End games as soon as they cannot be won anymore, see Game.play_game. Defaults to False.
+        telemetry (bool, optional): Record the per-turn telemetry of every game into the field "telemetry" of its result, see boardgame.telemetry (requires NumPy). Defaults to False.
+
+    Returns:
+        list[dict]: Result dictionaries in the order of the seeds.
+    """
+    from boardgame.scenario import Scenario
+    # the parameters are validated once for all games
+    scenario = Scenario.from_game_kwargs(**(game_kwargs or {}))
+    recorder = None
+    if telemetry:
+        from boardgame.telemetry import TelemetryRecorder
+        # one recorder for all games, its arrays are copied into each result
+        recorder = TelemetryRecorder()
+    return [_play_scenario(random_seed, scenario, agent_kwargs, terminate_early, recorder) for random_seed in random_seeds]
+
+
+def count_wins(random_seeds:list[int], game_kwargs:dict = None, agent_kwargs:dict = None) -> int:
+    """Play one game per random seed and count the won games. Only the count is sent back from worker processes. Games that cannot be won anymore are terminated early.
+
+    Args:
+        random_seeds (list[int]): Random seeds of the games.
+        game_kwargs (dict, optional): Game parameters, see Game. Defaults to None.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+
+    Returns:
+        int: Number of won games.
+    """
+    return len([result for result in play_games(random_seeds, game_kwargs, agent_kwargs, terminate_early=True) if result["result"] == "WON"])
+
+
+def summarize_games(random_seeds:list[int], game_kwargs:dict = None, agent_kwargs:dict = None, terminate_early:bool = False) -> GameSummary:
+    """Play one game per random seed and aggregate the results while playing. Only the summary is sent back from worker processes.
+
+    Args:
+        random_seeds (list[int]): Random seeds of the games.
+        game_kwargs (dict, optional): Game parameters, see Game. Defaults to None.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+        terminate_early (bool, optional): End games as soon as they cannot be won anymore, see Game.play_game. Defaults to False.
+
+    Returns:
+        GameSummary: Summary of the games.
+    """
+    from boardgame.scenario import Scenario
+    scenario = Scenario.from_game_kwargs(**(game_kwargs or {}))
+    summary = GameSummary()
+    for random_seed in random_seeds:
+        summary.add(_play_scenario(random_seed, scenario, agent_kwargs, terminate_early))
+    return summary
+
+
+def parameter_points(parameter_grid:dict[str, list]) -> list[dict]:
+    """Get all combinations of the values of a parameter grid.
+
+    Args:
+        parameter_grid (dict[str, list]): Values per game parameter.
+
+    Returns:
+        list[dict]: One dictionary of game parameters per combination.
+    """
+    names = list(parameter_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*parameter_grid.values())]
+
+
+def run_sweep(parameter_grid:dict[str, list], random_seeds:list[int], agent_kwargs:dict = None, executor:Executor = None, max_workers:int = None, chunk_size:int = 50,
+              terminate_early:bool = False, telemetry_path:str = None) -> list[dict]:
+    """Play every combination of a parameter grid on every random seed. The games are submitted in chunks of seeds to an executor, by default a thread pool.
+
+    Args:
+        parameter_grid (dict[str, list]): Values per game parameter, see Game.
+        random_seeds (list[int]): Random seeds played for every combination.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+        executor (Executor, optional): Executor the chunks are submitted to, e.g. a ProcessPoolExecutor. Defaults to a new ThreadPoolExecutor.
+        max_workers (int, optional): Number of threads of the default executor. Defaults to None.
+        chunk_size (int, optional): Number of seeds per submitted work unit. Defaults to 50.
+        terminate_early (bool, optional): End games as soon as they cannot be won anymore, see Game.play_game. Defaults to False.
+        telemetry_path (str, optional): Record the per-turn telemetry of every game and save it to this .npz file with save_telemetry, the array "game" holds the index of
+            the result in the returned list. The results keep their telemetry in the field "telemetry". Requires NumPy. Defaults to None, i.e. no telemetry.
+
+    Returns:
+        list[dict]: Result dictionaries with the additional field "random_seed" and one field per swept parameter, ordered by combination and seed.
+    """
+    random_seeds = list(random_seeds)
+    chunks = [random_seeds[i:i + chunk_size] for i in range(0, len(random_seeds), chunk_size)]
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [(game_kwargs, executor.submit(play_games, chunk, game_kwargs, agent_kwargs, terminate_early, telemetry_path is not None)) for game_kwargs in parameter_points(parameter_grid) for chunk in chunks]
+        results = []
+        for game_kwargs, future in futures:
+            for result in future.result():
+                result.update(game_kwargs)
+                results.append(result)
+        if telemetry_path is not None:
+            from boardgame.telemetry import save_telemetry
+            save_telemetry(results, telemetry_path)
+        return results
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def run_sweep_summaries(parameter_grid:dict[str, list], random_seeds:Iterable[int], agent_kwargs:dict = None, executor:Executor = None, max_workers:int = None, chunk_size:int = 50,
+                        callback:Callable[[dict], None] = None, terminate_early:bool = False) -> list[dict]:
+    """Play every combination of a parameter grid on every random seed like run_sweep, but keep only a GameSummary per combination. Every chunk of seeds
+    is summarized by its worker, and the summaries are merged in the order the chunks were submitted, so the quantile sketches and the results are the same in
+    every run. The seeds are read lazily and only about two chunks per worker are submitted or waiting to be merged at a time, so the memory does not grow with the number of seeds.
+
+    Args:
+        parameter_grid (dict[str, list]): Values per game parameter, see Game.
+        random_seeds (Iterable[int]): Random seeds played for every combination, read once, e.g. a range or a generator.
+        agent_kwargs (dict, optional): Agent heuristic parameters, see AGENT_PARAMETERS in config.py. Defaults to None.
+        executor (Executor, optional): Executor the chunks are submitted to, e.g. a ProcessPoolExecutor. Defaults to a new ThreadPoolExecutor.
+        max_workers (int, optional): Number of threads of the default executor, also used to size the window of submitted chunks. Defaults to None, i.e. the number of CPUs.
+        chunk_size (int, optional): Number of seeds per submitted work unit. Defaults to 50.
+        callback (Callable[[dict], None], optional): Called after every merged chunk with the live summary of its combination (same fields as the returned summaries). Defaults to None.
+        terminate_early (bool, optional): End games as soon as they cannot be won anymore, see Game.play_game. Defaults to False.
+
+    Returns:
+        list[dict]: One summary per combination in the order of parameter_points, with one field per swept parameter and the fields of GameSummary.to_dict.
+    """
+    points = parameter_points(parameter_grid)
+    summaries = [GameSummary() for _ in points]
+    # (index of the combination, chunk of seeds), the seeds are consumed once and shared by all combinations
+    seeds = iter(random_seeds)
+    work_units = enumerate((index, chunk) for chunk in iter(lambda: list(itertools.islice(seeds, chunk_size)), []) for index in range(len(points)))
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    # running future -> (number of the work unit, index of the combination)
+    futures = {}
+    # finished work units that wait for the units submitted before them, number of the work unit -> (index of the combination, summary)
+    finished = {}
+    next_unit = 0
+    try:
+        while True:
+            for unit, (index, chunk) in itertools.islice(work_units, window - len(futures) - len(finished)):
+                futures[executor.submit(summarize_games, chunk, points[index], agent_kwargs, terminate_early)] = (unit, index)
+            if not futures:
+                break
+            for future in wait(futures, return_when=FIRST_COMPLETED).done:
+                unit, index = futures.pop(future)
+                finished[unit] = (index, future.result())
+            while next_unit in finished:
+                index, summary = finished.pop(next_unit)
+                next_unit += 1
+                summaries[index].merge(summary)
+                if callback is not None:
+                    callback({**points[index], **summaries[index].to_dict()})
+        return [{**game_kwargs, **summary.to_dict()} for game_kwargs, summary in zip(points, summaries)]
+    finally:
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
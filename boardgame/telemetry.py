@@ -0,0 +1,106 @@
+"""Per-turn telemetry of games as NumPy time series.
+
+A TelemetryRecorder is registered with Game.set_telemetry and records the state of the game at the end of every turn into preallocated arrays.
+The arrays grow by doubling, so recording costs a small constant per turn. The recorded series are added to the result dictionary of Game.play_game under the key "telemetry".
+
+    g = Game(random_seed=1, disable_logging=True)
+    g.set_agent(Agent(g))
+    g.set_telemetry(TelemetryRecorder())
+    result = g.play_game()
+    result["telemetry"]["cascade_level"]
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import numpy as np
+# enable import only for type checking to avoid recursive imports
+if TYPE_CHECKING:
+    from boardgame.classes import Game
+
+# names of the recorded series with one value per turn
+TELEMETRY_FIELDS = ("turn", "destruction_level", "cascade_level", "total_damage", "freight_on_lane", "invalid_actions")
+
+
+class TelemetryRecorder():
+    """Records per-turn trajectories of a game. A recorder can be reused for several games, recording starts from scratch whenever it is registered with a game.
+    """
+    def __init__(self, initial_capacity:int = 64) -> None:
+        """Constructor of boardgame.telemetry.TelemetryRecorder
+
+        Args:
+            initial_capacity (int, optional): Number of turns the arrays can hold before they grow. Defaults to 64.
+        """
+        self.capacity = initial_capacity
+        self.length = 0
+        self.series = {field: np.zeros(initial_capacity, dtype=np.int32) for field in TELEMETRY_FIELDS}
+        # funds per player, one column per player in the order of Game.players
+        self.funds = np.zeros((initial_capacity, 0), dtype=np.int32)
+        self._node_ids_on_lane = frozenset()
+        self._invalid_actions_before = 0
+
+    def attach(self, game:Game) -> None:
+        """Internally called by Game.set_telemetry to prepare recording for a new game.
+
+        Args:
+            game (Game): The game that will be recorded.
+        """
+        self.length = 0
+        self._invalid_actions_before = game.invalid_actions
+        self._node_ids_on_lane = frozenset(game.graph.shortest_path(game.start_node_id, game.end_node_id))
+        if self.funds.shape[1] != len(game.players):
+            self.funds = np.zeros((self.capacity, len(game.players)), dtype=np.int32)
+
+    def record(self, game:Game) -> None:
+        """Record the current state of the game as one turn. Only damaged nodes and nodes with freight are visited, so the cost does not depend on the board size.
+
+        Args:
+            game (Game): The recorded game.
+        """
+        if self.length == self.capacity:
+            self._grow()
+        i = self.length
+        series = self.series
+        series["turn"][i] = game.turn
+        series["destruction_level"][i] = game.destruction_level
+        series["cascade_level"][i] = game.cascade_level
+        series["total_damage"][i] = sum([game._get_node_by_id(node_id).damage for node_id in game.damaged_node_ids])
+        series["freight_on_lane"][i] = sum([game._get_node_by_id(node_id).freight for node_id in game.freight_node_ids if node_id in self._node_ids_on_lane])
+        series["invalid_actions"][i] = game.invalid_actions - self._invalid_actions_before
+        self._invalid_actions_before = game.invalid_actions
+        for column, player in enumerate(game.players):
+            self.funds[i, column] = player.funds
+        self.length += 1
+
+    def _grow(self) -> None:
+        """Internally called to double the capacity of all arrays.
+        """
+        for field, values in self.series.items():
+            grown = np.zeros(self.capacity * 2, dtype=values.dtype)
+            grown[:self.capacity] = values
+            self.series[field] = grown
+        grown = np.zeros((self.capacity * 2, self.funds.shape[1]), dtype=self.funds.dtype)
+        grown[:self.capacity] = self.funds
+        self.funds = grown
+        self.capacity *= 2
+
+    def to_dict(self) -> dict[str, np.ndarray]:
+        """Get a copy of the recorded series, trimmed to the number of recorded turns.
+
+        Returns:
+            dict[str, np.ndarray]: One array per field in TELEMETRY_FIELDS and the array "funds" with one column per player.
+        """
+        result = {field: values[:self.length].copy() for field, values in self.series.items()}
+        result["funds"] = self.funds[:self.length].copy()
+        return result
+
+
+def save_telemetry(results:list[dict], path:str) -> None:
+    """Store the telemetry of a list of game results (e.g. of a sweep) in a single .npz file. The series of all games are concatenated, the array "game" holds the index of the result each row belongs to.
+
+    Args:
+        results (list[dict]): Result dictionaries of Game.play_game with a "telemetry" entry.
+        path (str): Output path.
+    """
+    telemetries = [result["telemetry"] for result in results]
+    arrays = {field: np.concatenate([telemetry[field] for telemetry in telemetries]) for field in TELEMETRY_FIELDS + ("funds",)}
+    arrays["game"] = np.concatenate([np.full(len(telemetry["turn"]), index, dtype=np.int32) for index, telemetry in enumerate(telemetries)])
+    np.savez(path, **arrays)
@@ -0,0 +1,167 @@
+"""Evolutionary tuning of the heuristic parameters of the Agent.
+
+A genetic algorithm searches the parameter space in PARAMETER_SPACE. All candidates are evaluated on the same (common) random seeds in a process pool.
+Evaluations are cached per candidate, and candidates whose win rate on the first chunk of seeds is clearly worse than the best fully evaluated candidate
+are rejected without playing the remaining seeds.
+
+    from boardgame.tuning import tune_agent_parameters
+    result = tune_agent_parameters(game_kwargs={"cascade_max_level": 10}, time_budget=300)
+    result["parameters"], result["win_rate"]
+"""
+from __future__ import annotations
+from boardgame.config import AGENT_PARAMETERS
+from boardgame.sweep import count_wins
+from boardgame.workers import init_worker
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
+import time
+
+# search range (lower bound, upper bound, is integer) of each tuned heuristic parameter. Boolean parameters are searched as 0 or 1.
+# The defaults of lane_repair_bonus and investor_share_threshold are far above their ranges (large values switch the behavior off), they are only
+# evaluated as part of the unclipped default candidate, see _default_candidate.
+PARAMETER_SPACE = {
+    'lane_repair_bonus': (0.0, 10.0, False),
+    'min_repair_damage': (1, 3, True),
+    'avoid_shared_repair_target': (0, 1, True),
+    'industry_extra_freight': (0, 3, True),
+    'industry_funds_reserve': (0, 4, True),
+    'investor_share_threshold': (0, 20, True),
+    'investor_follows_industry': (0, 1, True),
+}
+
+
+def candidate_to_agent_kwargs(candidate:tuple) -> dict:
+    """Convert a parameter vector to Agent keyword arguments.
+
+    Args:
+        candidate (tuple): Parameter values in the order of PARAMETER_SPACE.
+
+    Returns:
+        dict: Agent keyword arguments.
+    """
+    agent_kwargs = dict(zip(PARAMETER_SPACE, candidate))
+    for name, value in agent_kwargs.items():
+        if isinstance(AGENT_PARAMETERS[name], bool):
+            agent_kwargs[name] = bool(value)
+    return agent_kwargs
+
+
+def _normalize(candidate:list[float], clip:bool = True) -> tuple:
+    """Internally called to clip a parameter vector to the search space and round it, so that equivalent candidates share a cache entry.
+    """
+    values = []
+    for value, (lower, upper, is_integer) in zip(candidate, PARAMETER_SPACE.values()):
+        if clip:
+            value = min(max(value, lower), upper)
+        values.append(int(round(value)) if is_integer else round(value, 2))
+    return tuple(values)
+
+
+def _default_candidate() -> tuple:
+    """Internally called to get the parameter vector of the default strategy. It is not clipped to the search space, so the tuning is compared with the
+    actual default strategy. Its offspring are clipped as usual.
+    """
+    return _normalize([float(AGENT_PARAMETERS[name]) for name in PARAMETER_SPACE], clip=False)
+
+
+def _upper_bound(wins:int, games:int) -> float:
+    """Internally called to get an optimistic estimate (about two standard errors above the observed rate) of the win rate.
+    """
+    rate = wins / games
+    return rate + 2 * math.sqrt(rate * (1 - rate) / games) + 1 / games
+
+
+class _Evaluator():
+    """Internally used to evaluate candidates in a process pool with caching and early rejection.
+    """
+    def __init__(self, pool:ProcessPoolExecutor, game_kwargs:dict, random_seeds:list[int], chunk_size:int) -> None:
+        self.pool = pool
+        self.game_kwargs = game_kwargs
+        self.chunks = [random_seeds[i:i + chunk_size] for i in range(0, len(random_seeds), chunk_size)]
+        self.number_of_seeds = len(random_seeds)
+        # candidate -> (wins, games played)
+        self.cache:dict[tuple, tuple[int, int]] = {}
+        self.best:tuple = None
+
+    def win_rate(self, candidate:tuple) -> float:
+        wins, games = self.cache[candidate]
+        return wins / games
+
+    def evaluate(self, candidates:list[tuple]) -> None:
+        """Evaluate all candidates that are not cached yet.
+        """
+        new_candidates = list(dict.fromkeys(candidate for candidate in candidates if candidate not in self.cache))
+        # screening on the first chunk of seeds
+        futures = {candidate: self.pool.submit(count_wins, self.chunks[0], self.game_kwargs, candidate_to_agent_kwargs(candidate)) for candidate in new_candidates}
+        for candidate, future in futures.items():
+            self.cache[candidate] = (future.result(), len(self.chunks[0]))
+        # remaining seeds only for candidates that can still beat the best fully evaluated candidate
+        survivors = [candidate for candidate in new_candidates if self.best is None or _upper_bound(*self.cache[candidate]) >= self.win_rate(self.best)]
+        futures = {candidate: [self.pool.submit(count_wins, chunk, self.game_kwargs, candidate_to_agent_kwargs(candidate)) for chunk in self.chunks[1:]] for candidate in survivors}
+        for candidate, chunk_futures in futures.items():
+            self.cache[candidate] = (self.cache[candidate][0] + sum(future.result() for future in chunk_futures), self.number_of_seeds)
+            if self.best is None or self.win_rate(candidate) > self.win_rate(self.best):
+                self.best = candidate
+
+
+def tune_agent_parameters(game_kwargs:dict = None, number_of_seeds:int = 200, chunk_size:int = 50, population_size:int = 16, generations:int = 20, time_budget:float = 600, mutation_scale:float = 0.2, max_workers:int = None, random_seed:int = None) -> dict:
+    """Search agent parameters with a high win rate using a genetic algorithm.
+
+    The default strategy is part of the first generation, so the result is never worse than the default on the common seeds.
+    The search stops after the given number of generations or when the time budget is used up, whatever comes first. The first generation and every generation that has started are always completed.
+
+    Args:
+        game_kwargs (dict, optional): Game parameters the agent is tuned for. Defaults to None.
+        number_of_seeds (int, optional): Number of common random seeds every fully evaluated candidate plays. Defaults to 200.
+        chunk_size (int, optional): Number of seeds per work unit; the first chunk is used to reject clearly worse candidates early. Defaults to 50.
+        population_size (int, optional): Number of candidates per generation. Defaults to 16.
+        generations (int, optional): Maximum number of generations. Defaults to 20.
+        time_budget (float, optional): Wall time in seconds after which no new generation is started. Defaults to 600.
+        mutation_scale (float, optional): Standard deviation of mutations relative to the parameter range. Defaults to 0.2.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of processors.
+        random_seed (int, optional): Seed of the genetic algorithm. Defaults to None.
+
+    Returns:
+        dict: Result dictionary containing the fields "parameters" (Agent keyword arguments of the best candidate), "win_rate", "games", "generations", "evaluated_candidates" and "elapsed".
+    """
+    start = time.perf_counter()
+    game_kwargs = game_kwargs or {}
+    rng = random.Random(random_seed)
+    # seed 0 does not seed the game, so the common seeds start at 1
+    random_seeds = list(range(1, number_of_seeds + 1))
+    bounds = list(PARAMETER_SPACE.values())
+
+    def random_candidate() -> tuple:
+        return _normalize([rng.uniform(lower, upper) for lower, upper, _ in bounds])
+
+    def select(population:list[tuple]) -> tuple:
+        return max(rng.sample(population, min(3, len(population))), key=evaluator.win_rate)
+
+    def offspring(population:list[tuple]) -> tuple:
+        first_parent, second_parent = select(population), select(population)
+        child = [rng.choice(genes) for genes in zip(first_parent, second_parent)]
+        for i, (lower, upper, _) in enumerate(bounds):
+            if rng.random() < 1 / len(bounds):
+                child[i] += rng.gauss(0, mutation_scale * (upper - lower))
+        return _normalize(child)
+
+    population = [_default_candidate()] + [random_candidate() for _ in range(population_size - 1)]
+    generation = 0
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=([game_kwargs],)) as pool:
+        evaluator = _Evaluator(pool, game_kwargs, random_seeds, chunk_size)
+        while generation < generations and (generation == 0 or time.perf_counter() - start < time_budget):
+            evaluator.evaluate(population)
+            generation += 1
+            ranked = sorted(set(population), key=evaluator.win_rate, reverse=True)
+            # keep the two best candidates and fill up with offspring
+            population = ranked[:2] + [offspring(ranked) for _ in range(population_size - 2)]
+
+    return {
+        "parameters": candidate_to_agent_kwargs(evaluator.best),
+        "win_rate": evaluator.win_rate(evaluator.best),
+        "games": number_of_seeds,
+        "generations": generation,
+        "evaluated_candidates": len(evaluator.cache),
+        "elapsed": time.perf_counter() - start
+    }
@@ -0,0 +1,23 @@
+"""Helpers for worker processes of simulation sweeps.
+
+Spawn based process pools start every worker from a fresh interpreter. Passing init_worker as initializer moves the imports, the map parsing and the path searches
+to the start of the worker, so they are paid once per process instead of in the first game of every task.
+
+    with ProcessPoolExecutor(initializer=init_worker, initargs=([{"cascade_max_level": 10}],)) as pool:
+        ...
+"""
+from __future__ import annotations
+
+
+def init_worker(game_kwargs_list:list[dict] = None) -> None:
+    """Warm up a worker process: import the game modules, parse the map files, build the game templates and fill the path cache of every map with the lane of each configuration.
+
+    Args:
+        game_kwargs_list (list[dict], optional): Game keyword arguments of the configurations the worker will play, e.g. the parameter points of a sweep. Defaults to the default configuration only.
+    """
+    from boardgame.agent import Agent
+    from boardgame.scenario import Scenario
+    for game_kwargs in game_kwargs_list or [{}]:
+        # building one game and agent loads the map, builds the template of the scenario and caches the lane between start and end node
+        game = Scenario.from_game_kwargs(**game_kwargs).new_game(disable_logging=True)
+        Agent(game)
@@ -1,5 +1,7 @@
 from boardgame.classes import Game
 from boardgame.agent import Agent, find_shortest_path, flatten_list, parse_nodes_to_graph_format
+from boardgame.config import REPAIR_ACTION_NAME
+from boardgame.player_actions import ACTIONS
 import unittest
 
 
@@ -38,3 +40,34 @@ class TestAgent(unittest.TestCase):
 
     def test_get_next_action_for_player(self): 
         self.assertTrue(True)
+
+    def test_unknown_agent_parameter(self):
+        g = Game(0)
+        with self.assertRaises(ValueError):
+            Agent(g, lane_bonus=1)
+
+    def test_investor_shares_funds(self):
+        g = Game(0)
+        a = Agent(g, investor_share_threshold=1)
+        investor = g.players[1]
+        action = a._choose_investor_actions(investor).pop_action(g, investor.id)
+        self.assertEqual(action.parameters, {'target_player_id': 0})
+
+    def test_plans_create_actions_lazily(self):
+        g = Game(1, disable_logging=True)
+        a = Agent(g)
+        driver = g.players[2]
+        plan = a._choose_driver_actions(driver)
+        target_id = a.repair_targets[-1].id
+        self.assertEqual(len(plan), len(g.graph.route(driver.location_id, target_id)))
+        actions = [plan.pop_action(g, driver.id) for _ in range(len(plan))]
+        self.assertEqual([action.parameters['destination_id'] for action in actions[:-1]], g.graph.shortest_path(driver.location_id, target_id)[1:])
+        self.assertEqual(actions[-1].action, ACTIONS[REPAIR_ACTION_NAME])
+        self.assertEqual(len(plan), 0)
+
+    def test_reset_plan(self):
+        g = Game(1, disable_logging=True)
+        a = Agent(g)
+        a.get_next_action_for_player(2)
+        a.reset_plan(2)
+        self.assertEqual(len(a.action_queues[2]), 0)
@@ -0,0 +1,84 @@
+from boardgame.aggregates import GameSummary, QuantileSketch, RunningStatistics
+from boardgame.config import GAME_LOST_STR_CARDS, GAME_LOST_STR_CASCADE, GAME_LOST_STR_UNWINNABLE
+import math
+import random
+import statistics
+import unittest
+
+
+class TestAggregates(unittest.TestCase):
+
+    def test_running_statistics(self) -> None:
+        values = [random.Random(1).uniform(0, 100) for _ in range(10)] + list(range(50))
+        first, second = RunningStatistics(), RunningStatistics()
+        for value in values[:17]:
+            first.add(value)
+        for value in values[17:]:
+            second.add(value)
+        first.merge(second)
+        self.assertEqual(first.count, len(values))
+        self.assertAlmostEqual(first.mean, statistics.mean(values))
+        self.assertAlmostEqual(first.variance, statistics.variance(values))
+        self.assertTrue(math.isnan(RunningStatistics().variance))
+
+    def test_quantile_sketch_has_fixed_memory(self) -> None:
+        rng = random.Random(1)
+        values = [rng.random() for _ in range(20000)]
+        sketches = [QuantileSketch(k=64) for _ in range(4)]
+        for index, value in enumerate(values):
+            sketches[index % 4].add(value)
+        for sketch in sketches[1:]:
+            sketches[0].merge(sketch)
+        sketch = sketches[0]
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum(len(items) for items in sketch.compactors), 400)
+        for q in (0.1, 0.5, 0.9):
+            self.assertAlmostEqual(sketch.quantile(q), q, delta=0.05)
+
+    def test_quantile_sketch_is_exact_while_small(self) -> None:
+        sketch = QuantileSketch()
+        for value in [5, 1, 4, 2, 3]:
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.5), 3)
+        self.assertEqual(sketch.quantile(1), 5)
+        self.assertTrue(math.isnan(QuantileSketch().quantile(0.5)))
+
+    def test_game_summary(self) -> None:
+        results = [
+            {"turn": 30, "result": "WON"},
+            {"turn": 20, "result": "LOST", "reason": GAME_LOST_STR_CASCADE},
+            {"turn": 40, "result": "LOST", "reason": GAME_LOST_STR_CARDS, "terminated_early": False},
+            {"turn": 10, "result": "LOST", "reason": GAME_LOST_STR_UNWINNABLE, "terminated_early": True},
+            {"turn": 20, "result": "LOST", "reason": GAME_LOST_STR_CASCADE, "terminated_early": False},
+        ]
+        first, second = GameSummary(), GameSummary()
+        for result in results[:1]:
+            first.add(result)
+        for result in results[1:]:
+            second.add(result)
+        first.merge(second)
+        summary = first.to_dict()
+        self.assertEqual(summary["games"], 5)
+        self.assertEqual(summary["wins"], 1)
+        self.assertEqual(summary["win_rate"], 0.2)
+        self.assertEqual(summary["losses"], {GAME_LOST_STR_CASCADE: 2, GAME_LOST_STR_CARDS: 1})
+        self.assertEqual(summary["terminated_early"], 1)
+        self.assertEqual(summary["turn_mean"], 27.5)
+        self.assertEqual(summary["turn_histogram"], {20: 2, 30: 1, 40: 1})
+        self.assertEqual(summary["turn_quantiles"][0.5], 20)
+
+    def test_game_summary_of_terminated_games_only(self) -> None:
+        summary = GameSummary()
+        for turn in (10, 12):
+            summary.add({"turn": turn, "result": "LOST", "reason": GAME_LOST_STR_UNWINNABLE, "terminated_early": True})
+        summary = summary.to_dict()
+        self.assertEqual(summary["games"], 2)
+        self.assertEqual(summary["win_rate"], 0)
+        self.assertEqual(summary["terminated_early"], 2)
+        self.assertTrue(math.isnan(summary["turn_mean"]))
+        self.assertTrue(math.isnan(summary["turn_std"]))
+        self.assertEqual(summary["turn_histogram"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 from boardgame.agent import Agent
 from boardgame.classes import Game
+from boardgame.config import GAME_LOST_STR_UNWINNABLE
 import unittest
 
 
@@ -10,3 +11,62 @@ class TestGame(unittest.TestCase):
         g.set_agent(Agent(g))
         result = g.play_game()
         self.assertTrue(True)
+
+    def test_fast_forward_gives_identical_games(self) -> None:
+        for agent_kwargs in [{}, {"min_repair_damage": 2, "avoid_shared_repair_target": True}, {"investor_follows_industry": True, "investor_share_threshold": 2}]:
+            for random_seed in range(1, 31):
+                games = []
+                for fast_forward in (False, True):
+                    g = Game(random_seed=random_seed, disable_logging=True)
+                    g.set_agent(Agent(g, **agent_kwargs))
+                    result = g._drive(g.play_game_steps(fast_forward_passive_turns=fast_forward))
+                    games.append((result, g.invalid_actions, [node.damage for node in g.nodes], [player.funds for player in g.players], [node.id for node in g.agent.repair_targets], g.damage_cards, g.damage_card_segments))
+                self.assertEqual(games[0], games[1])
+
+    def test_logging_does_not_change_the_game(self) -> None:
+        for random_seed in range(1, 11):
+            games = []
+            for disable_logging in (False, True):
+                g = Game(random_seed=random_seed, disable_logging=disable_logging)
+                g.set_agent(Agent(g))
+                games.append((g.play_game(), [node.damage for node in g.nodes], g.damage_cards, g.damage_cards_discards, g.damage_card_segments))
+            self.assertEqual(games[0], games[1])
+
+    def test_passive_turn_is_skipped(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        g.set_agent(Agent(g))
+        g.active_player_id = 1
+        requests = list(g.action_phase_steps(fast_forward_passive_turns=True))
+        self.assertEqual(requests, [])
+        self.assertEqual(g.players[1].actions_left, 0)
+
+    def test_terminate_early_gives_same_result(self) -> None:
+        terminated = 0
+        for random_seed in range(1, 31):
+            results = []
+            for terminate_early in (False, True):
+                g = Game(random_seed=random_seed, disable_logging=True, target_amount=6)
+                g.set_agent(Agent(g))
+                results.append(g.play_game(terminate_early=terminate_early))
+            full_result, result = results
+            self.assertEqual(result["result"], full_result["result"])
+            if result.pop("terminated_early"):
+                terminated += 1
+                self.assertLessEqual(result["turn"], full_result["turn"])
+                # the full game may have been lost by either reason, so none of them is reported
+                self.assertEqual(result["reason"], GAME_LOST_STR_UNWINNABLE)
+            else:
+                self.assertEqual(result, full_result)
+        self.assertGreater(terminated, 0)
+
+    def test_can_still_win(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        self.assertTrue(g.can_still_win())
+        # the industry player (ID 0) acts in the current turn only
+        g.player_cards = g.player_cards[:2]
+        self.assertFalse(g.can_still_win())
+        g._get_node_by_id(g.end_node_id).freight = g.target_freight - 1
+        g._get_node_by_id(g.graph.neighbors(g.end_node_id)[0]).freight = 1
+        self.assertTrue(g.can_still_win())
+        g.active_player_id = 1
+        self.assertFalse(g.can_still_win())
@@ -0,0 +1,78 @@
+from boardgame.distributed import STOP_FILE, SweepCoordinator, _claim_unit, run_worker
+from boardgame.sweep import run_sweep
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+
+class TestDistributed(unittest.TestCase):
+
+    def test_local_workers_match_thread_sweep(self) -> None:
+        grid = {"cascade_max_level": [4, 8]}
+        random_seeds = range(1, 31)
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as directory:
+            workers = [subprocess.Popen([sys.executable, "-m", "boardgame.distributed", "worker", directory, "--worker-id", f"w{i}", "--idle-timeout", "60"], cwd=directory, env={**os.environ, "PYTHONPATH": project_root}) for i in range(3)]
+            try:
+                results = SweepCoordinator(directory, grid, random_seeds, seeds_per_unit=7).run(poll_interval=0.05, timeout=60)
+            finally:
+                for worker in workers:
+                    worker.wait(timeout=60)
+        self.assertEqual(results, run_sweep(grid, random_seeds))
+        self.assertEqual([worker.returncode for worker in workers], [0, 0, 0])
+
+    def test_expired_lease_is_handed_out_again(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            coordinator = SweepCoordinator(directory, {"cascade_max_level": [4]}, range(1, 5), seeds_per_unit=2, lease_timeout=10)
+            coordinator.submit()
+            unit, lease_path = _claim_unit(directory, "lost")
+            self.assertFalse(coordinator.poll())
+            self.assertEqual(len(os.listdir(os.path.join(directory, "pending"))), 1)
+            # the worker stops renewing its lease
+            os.utime(lease_path, (time.time() - 20, time.time() - 20))
+            self.assertFalse(coordinator.poll())
+            self.assertEqual(sorted(os.listdir(os.path.join(directory, "pending"))), ["000000.json", "000001.json"])
+            self.assertEqual(coordinator.attempts[unit["unit_id"]], 2)
+            self.assertEqual(run_worker(directory, "backup", idle_timeout=0), 2)
+            self.assertTrue(coordinator.poll())
+            self.assertEqual([result["random_seed"] for result in coordinator.merged_results()], [1, 2, 3, 4])
+
+    def test_submit_removes_stale_stop_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            first = SweepCoordinator(directory, {"cascade_max_level": [4]}, range(1, 3), seeds_per_unit=2)
+            first.submit()
+            first.stop()
+            self.assertTrue(os.path.exists(os.path.join(directory, STOP_FILE)))
+            second = SweepCoordinator(directory, {"cascade_max_level": [8]}, range(1, 3), seeds_per_unit=2)
+            second.submit()
+            self.assertFalse(os.path.exists(os.path.join(directory, STOP_FILE)))
+            self.assertEqual(run_worker(directory, "late", idle_timeout=0), 1)
+
+    def test_second_sweep_in_the_same_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            for grid in ({"cascade_max_level": [4]}, {"cascade_max_level": [8]}):
+                coordinator = SweepCoordinator(directory, grid, range(1, 5), seeds_per_unit=2)
+                coordinator.submit()
+                self.assertFalse(coordinator.poll())
+                run_worker(directory, "w", idle_timeout=0)
+                self.assertTrue(coordinator.poll())
+                self.assertEqual(coordinator.merged_results(), run_sweep(grid, range(1, 5)))
+                coordinator.stop()
+
+    def test_failing_unit_is_retried_until_max_attempts(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            coordinator = SweepCoordinator(directory, {"cascade_max_level": [4]}, range(1, 3), agent_kwargs={"unknown_parameter": 1}, max_attempts=2)
+            coordinator.submit()
+            run_worker(directory, "w", idle_timeout=0)
+            self.assertFalse(coordinator.poll())
+            self.assertEqual(coordinator.attempts["000000"], 2)
+            run_worker(directory, "w", idle_timeout=0)
+            with self.assertRaises(RuntimeError):
+                coordinator.poll()
+
+
+if __name__ == '__main__':
+    unittest.main()
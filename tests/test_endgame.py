@@ -0,0 +1,123 @@
+from boardgame.agent import Agent
+from boardgame.classes import Game, _create_and_shuffle_player_cards
+from boardgame.config import PLAYER_TYPE_DRIVER, PLAYER_TYPE_INDUSTRY, PLAYER_TYPE_INVESTOR
+from boardgame.endgame import EndgameOracle, EndgameSolver, SolverLimitExceeded, available_industry_actions, destruction_card_probability, minimum_industry_actions
+import itertools
+import unittest
+
+
+class TestEndgame(unittest.TestCase):
+
+    def _endgame(self, g:Game = None) -> Game:
+        """Industry player (ID 0) one transport away from winning in the next turn, the active driver cannot repair, damage on every even node triggers a lost cascade.
+        """
+        g = g or Game(random_seed=3, disable_logging=True)
+        for node in g.nodes:
+            node.damage = 0
+            node.freight = 0
+        self.critical_node_ids = [node_id for node_id in range(2, 18, 2)]
+        for node_id in self.critical_node_ids:
+            g._get_node_by_id(node_id).damage = g.cascade_damage_threshold
+        g.cascade_level = g.cascade_max_level
+        g._get_node_by_id(g.end_node_id).freight = g.target_freight - 1
+        g._get_node_by_id(18).freight = 1
+        g.players[0].location_id = 18
+        g.players[3].funds = 0
+        g.active_player_id = 3
+        g.player_cards = [1]
+        return g
+
+    def test_win_probability_is_exact(self) -> None:
+        g = self._endgame()
+        safe_cards = [card for card in g.damage_cards if card not in self.critical_node_ids]
+        self.assertAlmostEqual(EndgameSolver(g).win_probability(), len(safe_cards) / len(g.damage_cards))
+
+    def test_win_probability_knows_the_windows_of_the_destruction_cards(self) -> None:
+        g = Game(random_seed=4, disable_logging=True, number_of_fund_cards=8, number_of_destruction_cards=2)
+        while g.player_cards_discards[-1:] != [0]:
+            g.draw_player_card()
+        # the second destruction card is in the last window, which has 1 of its 5 cards drawn already
+        self.assertEqual((len(g.player_cards_discards), len(g.player_cards)), (5, 5))
+        player_cards = g.player_cards
+        self._endgame(g)
+        g.player_cards = player_cards
+        # a fund card draws the joker, a destruction card draws the joker with 3 damage, puts it back on top and draws it again followed by a critical node
+        g.destruction_level = 1
+        g.damage_cards = [self.critical_node_ids[0], 0]
+        g.damage_card_segments = [1, 1]
+        g.damage_cards_discards = []
+        self.assertAlmostEqual(EndgameSolver(g).win_probability(), 1 - 1 / 3)
+
+    def test_destruction_card_probability(self) -> None:
+        class Positions():
+            def __init__(self, positions):
+                self.positions = iter(positions)
+
+            def randint(self, a, b):
+                return next(self.positions)
+
+        number_of_fund_cards, number_of_destruction_cards = 7, 3
+        step = -(-number_of_fund_cards // number_of_destruction_cards)
+        # every stack _create_and_shuffle_player_cards can deal, in the order of the draws
+        stacks = [_create_and_shuffle_player_cards(number_of_fund_cards, number_of_destruction_cards, rng=Positions(positions))[::-1]
+                  for positions in itertools.product(*[range(x * step, (x + 1) * step + 1) for x in range(number_of_destruction_cards)])]
+        for stack in stacks:
+            for drawn_cards in range(len(stack)):
+                draws = tuple(draw for draw in range(drawn_cards) if stack[draw] == 0)
+                possible = [other for other in stacks if tuple(draw for draw in range(drawn_cards) if other[draw] == 0) == draws]
+                expected = sum(other[drawn_cards] == 0 for other in possible) / len(possible)
+                self.assertAlmostEqual(destruction_card_probability(number_of_fund_cards, number_of_destruction_cards, draws, drawn_cards), expected)
+
+    def test_damage_card_segments(self) -> None:
+        g = self._endgame()
+        g.cascade_level = 0
+        g.damage_cards_discards = [16]
+        g.player_cards = [0]
+        g.draw_player_card()
+        self.assertEqual(g.damage_card_segments[-1], 2)
+        solver = EndgameSolver(g)
+        self.assertEqual(solver.state()[-2][-1], tuple(sorted(g.damage_cards[-2:])))
+
+    def test_best_action_wins_immediately(self) -> None:
+        g = self._endgame()
+        g.active_player_id = 0
+        probability, action = EndgameSolver(g).best_action()
+        self.assertEqual(probability, 1.0)
+        self.assertEqual(action.parameters, {'destination_id': g.end_node_id})
+
+    def test_no_player_cards_left(self) -> None:
+        g = self._endgame()
+        g.player_cards = []
+        self.assertEqual(EndgameSolver(g).win_probability(), 0.0)
+
+    def test_time_limit(self) -> None:
+        g = Game(random_seed=3, disable_logging=True, target_amount=1, cascade_max_level=1)
+        g._get_node_by_id(g.start_node_id).freight = 0
+        g._get_node_by_id(9).freight = 1
+        g.players[0].location_id = 9
+        g.active_player_id = 2
+        g.player_cards = g.player_cards[-2:]
+        with self.assertRaises(SolverLimitExceeded):
+            # the search expands more than TIME_CHECK_INTERVAL states, so a limit of 0 is exceeded at the first check
+            EndgameSolver(g, time_limit=0).win_probability()
+
+    def test_minimum_industry_actions(self) -> None:
+        distances = {1: 3, 2: 1, 3: 0}
+        self.assertEqual(minimum_industry_actions({1: 1, 2: 1}, distances, 1, 3, 2), 4)
+        # a new unit costs 1 action more than a unit at the start node
+        self.assertEqual(minimum_industry_actions({2: 1}, distances, 1, 3, 2), 5)
+        self.assertEqual(minimum_industry_actions({3: 2}, distances, 1, 3, 2), 0)
+
+    def test_available_industry_actions(self) -> None:
+        player_types = [PLAYER_TYPE_INDUSTRY, PLAYER_TYPE_INVESTOR, PLAYER_TYPE_DRIVER, PLAYER_TYPE_DRIVER]
+        self.assertEqual(available_industry_actions(player_types, 0, 3, 0), 3)
+        self.assertEqual(available_industry_actions(player_types, 0, 3, 4), 7)
+        self.assertEqual(available_industry_actions(player_types, 1, 4, 2), 0)
+        self.assertEqual(available_industry_actions(player_types, 1, 4, 3), 4)
+
+    def test_oracle_agent(self) -> None:
+        for random_seed in range(1, 10):
+            g = Game(random_seed=random_seed, disable_logging=True)
+            g.set_agent(Agent(g, endgame_oracle=EndgameOracle(max_player_cards=2, time_limit=0.2)))
+            self.assertIn(g.play_game()["result"], ["WON", "LOST"])
+            self.assertEqual(sum(g.damage_card_segments), len(g.damage_cards))
@@ -0,0 +1,24 @@
+from boardgame.agent import find_shortest_path, parse_nodes_to_graph_format
+from boardgame.classes import Game
+from boardgame.graph import CSRGraph
+import unittest
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_neighbors_keep_map_order(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        for node in g.nodes:
+            self.assertEqual(list(g.graph.neighbors(node.id)), node.neighbors)
+
+    def test_shortest_path_matches_find_shortest_path(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        graph_dict = parse_nodes_to_graph_format(g.nodes)
+        for start in graph_dict:
+            for end in graph_dict:
+                self.assertEqual(g.graph.shortest_path(start, end), find_shortest_path(graph_dict, start, end))
+
+    def test_unreachable_node(self) -> None:
+        graph = CSRGraph([1, 2, 3], [[2], [1], []])
+        self.assertEqual(graph.shortest_path(1, 3), [])
+        self.assertEqual(graph.distances_from(1), {1: 0, 2: 1})
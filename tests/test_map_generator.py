@@ -0,0 +1,40 @@
+from boardgame.agent import Agent
+from boardgame.classes import Game
+from boardgame.map_generator import generate_map, validate_map, write_map
+import os
+import tempfile
+import unittest
+
+
+class TestMapGenerator(unittest.TestCase):
+
+    def test_generate_map(self) -> None:
+        entries, start_node_id, end_node_id = generate_map(2000, random_seed=3)
+        validate_map(entries)
+        self.assertEqual(len(entries), 2000)
+        ports = [entry["id"] for entry in entries if entry["node_type"] == "purple"]
+        self.assertIn(start_node_id, ports)
+        self.assertIn(end_node_id, ports)
+        self.assertNotEqual(start_node_id, end_node_id)
+
+    def test_generate_map_is_reproducible(self) -> None:
+        self.assertEqual(generate_map(300, random_seed=5), generate_map(300, random_seed=5))
+
+    def test_validate_map_rejects_asymmetric_neighbors(self) -> None:
+        entries = [
+            {"id": 1, "name": "a", "node_type": "purple", "neighbors": [2]},
+            {"id": 2, "name": "b", "node_type": "purple", "neighbors": []},
+        ]
+        with self.assertRaises(ValueError):
+            validate_map(entries)
+
+    def test_play_game_on_generated_map(self) -> None:
+        entries, start_node_id, end_node_id = generate_map(1000, random_seed=7)
+        with tempfile.TemporaryDirectory() as directory:
+            path_to_map = os.path.join(directory, "map.json")
+            write_map(entries, path_to_map)
+            g = Game(random_seed=1, disable_logging=True, path_to_map=path_to_map, target_start_node=start_node_id, target_end_node=end_node_id)
+        g.set_agent(Agent(g))
+        result = g.play_game()
+        self.assertIn(result["result"], ["WON", "LOST"])
+        self.assertTrue(all(card not in [start_node_id, end_node_id] for card in g.damage_cards + g.damage_cards_discards))
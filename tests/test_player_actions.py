@@ -0,0 +1,42 @@
+from boardgame.agent import Agent
+from boardgame.classes import Game
+from boardgame.config import DO_NOTHING_ACTION_NAME, REPAIR_ACTION_NAME, RUN_ACTION_NAME, SHARE_RESOURCES_ACTION_NAME
+from boardgame.player_actions import ACTION_CODES, InvalidActionException, compact_action, get_action_name, run_action
+import unittest
+
+
+class TestPlayerActions(unittest.TestCase):
+
+    def test_compact_actions_are_interned(self) -> None:
+        g, h = Game(random_seed=1, disable_logging=True), Game(random_seed=2, disable_logging=True)
+        self.assertIs(g.compact_action(RUN_ACTION_NAME, 5), h.compact_action(RUN_ACTION_NAME, 5))
+        self.assertIs(g.compact_action(DO_NOTHING_ACTION_NAME), h.compact_action(DO_NOTHING_ACTION_NAME))
+        self.assertEqual(g.compact_action(RUN_ACTION_NAME, 5), (ACTION_CODES[RUN_ACTION_NAME], 5))
+        self.assertEqual(g.compact_action(SHARE_RESOURCES_ACTION_NAME, 1), compact_action(SHARE_RESOURCES_ACTION_NAME, 1))
+        self.assertEqual(get_action_name(compact_action(DO_NOTHING_ACTION_NAME)), "do_player_action_nothing")
+
+    def test_run_compact_action(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        player = g.players[2]
+        destination_id = g._get_node_by_id(player.location_id).neighbors[0]
+        run_action(g, player.id, compact_action(RUN_ACTION_NAME, destination_id))
+        self.assertEqual(player.location_id, destination_id)
+        with self.assertRaises(InvalidActionException):
+            run_action(g, player.id, compact_action(RUN_ACTION_NAME, player.location_id))
+        if g._get_node_by_id(player.location_id).damage == 0:
+            with self.assertRaises(InvalidActionException):
+                run_action(g, player.id, compact_action(REPAIR_ACTION_NAME))
+
+    def test_compact_agent_plays_the_same_games(self) -> None:
+        for random_seed in range(1, 21):
+            results = []
+            for compact_actions in (False, True):
+                g = Game(random_seed=random_seed, disable_logging=True)
+                g.set_agent(Agent(g, compact_actions=compact_actions))
+                results.append((g.play_game(), g.invalid_actions))
+            self.assertEqual(results[0], results[1])
+            self.assertFalse(g.log_enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+from boardgame.classes import Game, _get_template
+from boardgame.scenario import Scenario
+from boardgame.sweep import play_games
+import pickle
+import unittest
+
+
+class TestScenario(unittest.TestCase):
+
+    def test_number_of_fund_cards_is_used(self) -> None:
+        g = Game(random_seed=1, disable_logging=True, number_of_fund_cards=40)
+        self.assertEqual(len(g.player_cards), 40 + 4)
+        self.assertEqual(g.scenario.number_of_fund_cards, 40)
+
+    def test_games_of_a_scenario_equal_games_of_kwargs(self) -> None:
+        scenario = Scenario(cascade_max_level=8, target_amount=4)
+        for random_seed in range(1, 6):
+            g = scenario.new_game(random_seed, disable_logging=True)
+            h = Game(random_seed=random_seed, disable_logging=True, cascade_max_level=8, target_amount=4)
+            self.assertEqual(g.damage_cards, h.damage_cards)
+            self.assertEqual(g.player_cards, h.player_cards)
+            self.assertEqual([node.damage for node in g.nodes], [node.damage for node in h.nodes])
+            self.assertEqual(g.damaged_node_ids, h.damaged_node_ids)
+            self.assertEqual(g.freight_node_ids, {g.start_node_id})
+
+    def test_games_do_not_share_nodes(self) -> None:
+        scenario = Scenario()
+        g, h = scenario.new_game(1, disable_logging=True), scenario.new_game(1, disable_logging=True)
+        g.nodes[5].freight = 3
+        self.assertEqual(h.nodes[5].freight, 0)
+        self.assertNotIn(g.nodes[5].id, h.freight_node_ids)
+        self.assertEqual(play_games([1, 2]), play_games([1, 2]))
+
+    def test_validation(self) -> None:
+        for kwargs in [{"target_amount": 0}, {"cascade_max_level": -1}, {"number_of_destruction_cards": 0}, {"number_of_fund_cards": "40"}, {"target_start_node": 99}, {"target_end_node": 19}]:
+            with self.assertRaises(ValueError):
+                Scenario(**kwargs)
+        with self.assertRaises(ValueError):
+            Game(random_seed=1, disable_logging=True, number_of_fundcards=40)
+        with self.assertRaises(ValueError):
+            Game(random_seed=1, disable_logging=True, scenario=Scenario(), target_amount=4)
+
+    def test_scenario_is_frozen_and_hashable(self) -> None:
+        scenario = Scenario()
+        with self.assertRaises(AttributeError):
+            scenario.target_amount = 5
+        self.assertEqual(Scenario.from_game_kwargs(target_amount=None), scenario)
+        self.assertEqual(len({scenario, Scenario()}), 1)
+        self.assertNotEqual(Scenario(cascade_max_level=8), scenario)
+        self.assertEqual(pickle.loads(pickle.dumps(scenario)), scenario)
+
+    def test_zero_is_a_value(self) -> None:
+        self.assertEqual(Scenario.from_game_kwargs(number_of_fund_cards=0).number_of_fund_cards, 0)
+        self.assertEqual(len(Game(random_seed=1, disable_logging=True, number_of_fund_cards=0).player_cards), 4)
+        with self.assertRaises(ValueError):
+            Scenario.from_game_kwargs(target_amount=0)
+
+    def test_scenarios_share_the_template_of_their_map(self) -> None:
+        self.assertIs(_get_template(Scenario(cascade_max_level=3)), _get_template(Scenario(cascade_max_level=4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
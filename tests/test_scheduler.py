@@ -0,0 +1,60 @@
+from boardgame.agent import Agent
+from boardgame.classes import DecisionRequest, Game
+from boardgame.config import REPAIR_ACTION_NAME
+from boardgame.player_actions import ACTIONS, PlayerAction
+from boardgame.scheduler import BatchScheduler, decide_with_game_agents, play_games_batched
+from boardgame.sweep import play_games
+import unittest
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_batched_games_match_sequential_games(self) -> None:
+        random_seeds = list(range(1, 61))
+        self.assertEqual(play_games_batched(random_seeds), play_games(random_seeds))
+
+    def test_requests_are_batched(self) -> None:
+        batch_sizes = []
+        def policy(requests):
+            batch_sizes.append(len(requests))
+            self.assertTrue(all(isinstance(request, DecisionRequest) for request in requests))
+            return decide_with_game_agents(requests)
+        results = play_games_batched(range(1, 21), policy=policy, max_batch_size=8)
+        self.assertEqual(len(results), 20)
+        self.assertEqual(batch_sizes[0], 8)
+        self.assertTrue(max(batch_sizes) <= 8)
+
+    def test_policy_must_answer_every_request(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        g.set_agent(Agent(g))
+        scheduler = BatchScheduler(lambda requests: [])
+        scheduler.add_game(g)
+        with self.assertRaises(ValueError):
+            scheduler.run()
+
+    def test_policy_drives_a_game_without_agent(self) -> None:
+        g = Game(random_seed=1, disable_logging=True)
+        scheduler = BatchScheduler(lambda requests: [PlayerAction(request.game, request.player_id, ACTIONS[REPAIR_ACTION_NAME]) for request in requests])
+        scheduler.add_game(g)
+        result = scheduler.run()[0]
+        self.assertEqual(result["result"], "LOST")
+        self.assertGreater(g.invalid_actions, 0)
+
+    def test_steps_of_a_game_can_be_driven_manually(self) -> None:
+        g = Game(random_seed=3, disable_logging=True)
+        g.set_agent(Agent(g))
+        steps = g.play_game_steps()
+        request = next(steps)
+        try:
+            while True:
+                self.assertEqual(request.player_id, g.active_player_id)
+                request = steps.send(g.agent.get_next_action_for_player(request.player_id))
+        except StopIteration as e:
+            result = e.value
+        expected = play_games([3])[0]
+        del expected["random_seed"]
+        self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
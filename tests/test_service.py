@@ -0,0 +1,48 @@
+from boardgame.service import SweepService
+from boardgame.sweep import run_sweep
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import unittest
+
+
+class TestService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.service = SweepService(self.executor, chunk_size=5)
+
+    async def asyncTearDown(self) -> None:
+        await self.service.shutdown()
+        self.executor.shutdown()
+
+    async def test_streamed_results_match_sweep(self) -> None:
+        grid = {"cascade_max_level": [4, 8]}
+        job = self.service.submit(grid, range(1, 21))
+        events = [event async for event in job.stream()]
+        self.assertEqual(len(events), 40)
+        key = lambda result: (result["cascade_max_level"], result["random_seed"])
+        self.assertEqual(sorted([event["result"] for event in events], key=key), run_sweep(grid, range(1, 21)))
+        summaries = job.summaries()
+        self.assertEqual([summary["games"] for summary in summaries], [20, 20])
+        self.assertEqual(sum(summary["wins"] for summary in summaries), len([event for event in events if event["result"]["result"] == "WON"]))
+        self.assertEqual(events[-1]["summary"]["games"], 20)
+
+    async def test_identical_concurrent_requests_share_a_job(self) -> None:
+        job = self.service.submit({"cascade_max_level": [4]}, range(1, 11))
+        self.assertIs(self.service.submit({"cascade_max_level": [4]}, list(range(1, 11))), job)
+        self.assertIsNot(self.service.submit({"cascade_max_level": [5]}, range(1, 11)), job)
+        first, second = await asyncio.gather(job.wait(), job.wait())
+        self.assertEqual(first, second)
+        self.assertIsNot(self.service.submit({"cascade_max_level": [4]}, range(1, 11)), job)
+
+    async def test_cancel(self) -> None:
+        job = self.service.submit({"cascade_max_level": [4, 6, 8]}, range(1, 201))
+        with self.assertRaises(asyncio.CancelledError):
+            async for event in job.stream():
+                job.cancel()
+        self.assertTrue(job.cancelled())
+        self.assertLess(len(job.results), 600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+from boardgame.aggregates import GameSummary
+from boardgame.sweep import parameter_points, play_games, run_sweep, run_sweep_summaries, summarize_games
+from concurrent.futures import ThreadPoolExecutor
+import random
+import sys
+import time
+import unittest
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_parameter_points(self) -> None:
+        points = parameter_points({"cascade_max_level": [8, 10], "number_of_fund_cards": [40]})
+        self.assertEqual(points, [{"cascade_max_level": 8, "number_of_fund_cards": 40}, {"cascade_max_level": 10, "number_of_fund_cards": 40}])
+
+    def test_threaded_sweep_matches_sequential_games(self) -> None:
+        random_seeds = list(range(1, 41))
+        grid = {"cascade_max_level": [4, 8]}
+        expected = []
+        for game_kwargs in parameter_points(grid):
+            for result in play_games(random_seeds, game_kwargs):
+                result.update(game_kwargs)
+                expected.append(result)
+        switch_interval = sys.getswitchinterval()
+        # switch threads as often as possible to provoke interleaving
+        sys.setswitchinterval(1e-6)
+        try:
+            results = run_sweep(grid, random_seeds, max_workers=16, chunk_size=1)
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(results, expected)
+
+    def test_sweep_summaries_match_results(self) -> None:
+        random_seeds = list(range(1, 41))
+        grid = {"cascade_max_level": [4, 8]}
+        live_summaries = []
+        summaries = run_sweep_summaries(grid, random_seeds, max_workers=4, chunk_size=7, callback=live_summaries.append)
+        self.assertEqual(len(live_summaries), 2 * 6)
+        for game_kwargs, summary in zip(parameter_points(grid), summaries):
+            expected = GameSummary()
+            for result in play_games(random_seeds, game_kwargs):
+                expected.add(result)
+            expected = expected.to_dict()
+            self.assertEqual(summary["cascade_max_level"], game_kwargs["cascade_max_level"])
+            for field in ("games", "wins", "losses", "turn_histogram", "turn_quantiles"):
+                self.assertEqual(summary[field], expected[field])
+            self.assertAlmostEqual(summary["turn_mean"], expected["turn_mean"])
+
+    def test_sweep_summaries_submit_a_bounded_window(self) -> None:
+        running = []
+        submitted = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                running.append(None)
+                submitted.append(len(running))
+                future = super().submit(*args, **kwargs)
+                future.add_done_callback(lambda future: running.pop())
+                return future
+
+        with CountingExecutor(max_workers=2) as executor:
+            # a generator can only be read once, all combinations share its seeds
+            summaries = run_sweep_summaries({"cascade_max_level": [4, 8]}, (random_seed for random_seed in range(1, 41)), executor=executor, max_workers=2, chunk_size=2)
+        self.assertEqual([summary["games"] for summary in summaries], [40, 40])
+        self.assertEqual(len(submitted), 40)
+        # a window of 4 chunks, done callbacks may run shortly after the sweep has refilled the window
+        self.assertLessEqual(max(submitted), 8)
+
+    def test_sweep_summaries_merge_in_submission_order(self) -> None:
+        submitted = []
+
+        class ReversingExecutor(ThreadPoolExecutor):
+            def submit(self, function, *args, **kwargs):
+                # every second chunk finishes before the chunk submitted before it
+                delay = 0.05 if len(submitted) % 2 == 0 else 0
+                submitted.append(None)
+                return super().submit(lambda: time.sleep(delay) or function(*args, **kwargs))
+
+        merged = []
+        with ReversingExecutor(max_workers=4) as executor:
+            summaries = run_sweep_summaries({"cascade_max_level": [4, 8]}, range(1, 121), executor=executor, max_workers=4, chunk_size=20,
+                                            callback=lambda summary: merged.append((summary["cascade_max_level"], summary["games"])))
+        self.assertEqual(merged, [(cascade_max_level, games) for games in range(20, 121, 20) for cascade_max_level in (4, 8)])
+        expected = GameSummary()
+        for start in range(1, 121, 20):
+            expected.merge(summarize_games(range(start, start + 20), {"cascade_max_level": 8}))
+        self.assertEqual(summaries[1], {"cascade_max_level": 8, **expected.to_dict()})
+
+    def test_games_do_not_use_global_random_state(self) -> None:
+        random.seed(123)
+        state = random.getstate()
+        play_games([1, 2])
+        self.assertEqual(random.getstate(), state)
+
+
+if __name__ == '__main__':
+    unittest.main()
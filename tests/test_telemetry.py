@@ -0,0 +1,57 @@
+from boardgame.agent import Agent
+from boardgame.classes import Game
+from boardgame.sweep import run_sweep
+from boardgame.telemetry import TELEMETRY_FIELDS, TelemetryRecorder, save_telemetry
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def _play(self, random_seed:int, recorder:TelemetryRecorder = None) -> dict:
+        g = Game(random_seed=random_seed, disable_logging=True)
+        g.set_agent(Agent(g))
+        if recorder is not None:
+            g.set_telemetry(recorder)
+        return g.play_game()
+
+    def test_one_row_per_turn(self) -> None:
+        result = self._play(1, TelemetryRecorder(initial_capacity=2))
+        telemetry = result["telemetry"]
+        self.assertEqual(list(telemetry["turn"]), list(range(result["turn"] + 1)))
+        for field in TELEMETRY_FIELDS:
+            self.assertEqual(len(telemetry[field]), result["turn"] + 1)
+        self.assertEqual(telemetry["funds"].shape, (result["turn"] + 1, 4))
+        self.assertTrue(np.all(np.diff(telemetry["destruction_level"]) >= 0))
+
+    def test_telemetry_does_not_change_the_result(self) -> None:
+        recorder = TelemetryRecorder()
+        for random_seed in range(1, 20):
+            result = self._play(random_seed, recorder)
+            del result["telemetry"]
+            self.assertEqual(result, self._play(random_seed))
+
+    def test_save_telemetry(self) -> None:
+        recorder = TelemetryRecorder()
+        results = [self._play(random_seed, recorder) for random_seed in range(1, 4)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.npz")
+            save_telemetry(results, path)
+            with np.load(path) as data:
+                self.assertEqual(len(data["game"]), sum(result["turn"] + 1 for result in results))
+                self.assertEqual(list(np.unique(data["game"])), [0, 1, 2])
+
+    def test_sweep_saves_telemetry(self) -> None:
+        grid = {"cascade_max_level": [4, 8]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.npz")
+            results = run_sweep(grid, range(1, 6), chunk_size=2, telemetry_path=path)
+            with np.load(path) as data:
+                self.assertEqual(list(np.unique(data["game"])), list(range(len(results))))
+                self.assertEqual(len(data["turn"]), sum(result["turn"] + 1 for result in results))
+                self.assertEqual(list(data["cascade_level"][data["game"] == 7]), list(results[7]["telemetry"]["cascade_level"]))
+        for result in results:
+            del result["telemetry"]
+        self.assertEqual(results, run_sweep(grid, range(1, 6), chunk_size=2))
@@ -0,0 +1,22 @@
+from boardgame.config import AGENT_PARAMETERS
+from boardgame.sweep import count_wins
+from boardgame.tuning import PARAMETER_SPACE, _default_candidate, candidate_to_agent_kwargs, tune_agent_parameters
+import unittest
+
+
+class TestTuning(unittest.TestCase):
+
+    def test_default_candidate_reproduces_default_strategy(self) -> None:
+        agent_kwargs = candidate_to_agent_kwargs(_default_candidate())
+        self.assertEqual(list(agent_kwargs), list(PARAMETER_SPACE))
+        self.assertIs(agent_kwargs['investor_follows_industry'], False)
+        # the defaults are not clipped to the search space
+        self.assertEqual(agent_kwargs, AGENT_PARAMETERS)
+        random_seeds = list(range(1, 31))
+        self.assertEqual(count_wins(random_seeds, agent_kwargs=agent_kwargs), count_wins(random_seeds))
+
+    def test_tune_agent_parameters(self) -> None:
+        result = tune_agent_parameters(number_of_seeds=20, chunk_size=10, population_size=4, generations=2, max_workers=2, random_seed=1)
+        self.assertEqual(result["generations"], 2)
+        self.assertGreaterEqual(result["win_rate"], count_wins(list(range(1, 21))) / 20)
+        self.assertEqual(set(result["parameters"]), set(PARAMETER_SPACE))
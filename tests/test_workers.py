@@ -0,0 +1,31 @@
+from boardgame import classes
+from boardgame.workers import init_worker
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class TestWorkers(unittest.TestCase):
+
+    def test_import_has_no_side_effects(self) -> None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as directory:
+            code = "import sys; import boardgame.classes, boardgame.agent; print('logging' in sys.modules)"
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=directory, env={**os.environ, "PYTHONPATH": project_root})
+            self.assertEqual(output.stdout.strip(), "False")
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_import_skips_modules_games_do_not_need(self) -> None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys; import boardgame.classes, boardgame.agent; print(sorted({'boardgame.endgame', 'dataclasses', 'inspect'} & set(sys.modules)))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": project_root})
+        self.assertEqual(output.stdout.strip(), "[]")
+
+    def test_init_worker_preloads_map_and_lane(self) -> None:
+        classes._MAP_CACHE.clear()
+        init_worker([{"target_end_node": 20}])
+        graph = classes._load_map()[1]
+        self.assertEqual(len(classes._MAP_CACHE), 1)
+        self.assertIn((19, 20), graph._path_cache)